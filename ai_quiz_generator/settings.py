@@ -13,6 +13,7 @@ import os
 from pathlib import Path
 
 from decouple import config  # type: ignore
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -90,11 +91,65 @@ WSGI_APPLICATION = 'ai_quiz_generator.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# "sqlite" for a local file or "postgres" for production
+
+DATABASE_ENGINE = config('DATABASE_ENGINE', default='sqlite')
+
+if DATABASE_ENGINE == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': config('POSTGRES_DB', default='ai_quiz_generator'),
+            'USER': config('POSTGRES_USER', default='postgres'),
+            'PASSWORD': config('POSTGRES_PASSWORD', default=''),
+            'HOST': config('POSTGRES_HOST', default='localhost'),
+            'PORT': config('POSTGRES_PORT', default=5432, cast=int),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
     }
+    # psycopg connection pool, it cannot be combined with persistent
+    # connections so CONN_MAX_AGE only applies without it
+    if config('POSTGRES_POOL', default=True, cast=bool):
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': config('POSTGRES_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': config('POSTGRES_POOL_MAX_SIZE', default=10, cast=int),
+            'timeout': config('POSTGRES_POOL_TIMEOUT', default=10, cast=int),
+        }
+    else:
+        DATABASES['default']['CONN_MAX_AGE'] = config('DATABASE_CONN_MAX_AGE', default=60, cast=int)
+else:
+    # WAL lets readers run alongside a writer; set SQLITE_JOURNAL_MODE=DELETE
+    # for the rollback journal
+    SQLITE_PRAGMAS = {
+        'journal_mode': config('SQLITE_JOURNAL_MODE', default='WAL'),
+        'synchronous': config('SQLITE_SYNCHRONOUS', default='NORMAL'),
+        'busy_timeout': config('SQLITE_BUSY_TIMEOUT', default=5000, cast=int),
+        # Negative values are in KiB
+        'cache_size': config('SQLITE_CACHE_SIZE', default=-20000, cast=int),
+        'mmap_size': config('SQLITE_MMAP_SIZE', default=128 * 1024 * 1024, cast=int),
+    }
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+            'OPTIONS': {
+                'init_command': ';'.join(
+                    f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()
+                ),
+                # Take the write lock up front so lock errors happen before any write
+                'transaction_mode': 'IMMEDIATE',
+                'timeout': config('SQLITE_BUSY_TIMEOUT', default=5000, cast=int) / 1000,
+            },
+        }
+    }
+
+# Retries of transactions which found the database locked by another writer
+
+DATABASE_LOCK_RETRY = {
+    'ATTEMPTS': config('DATABASE_LOCK_RETRY_ATTEMPTS', default=5, cast=int),
+    'DELAY': config('DATABASE_LOCK_RETRY_DELAY', default=0.05, cast=float),
 }
 
 # Password validation
@@ -148,6 +203,155 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static'
 ]
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+# "redis" for any Redis-compatible server at REDIS_URL, "locmem" for
+# per-process local memory.
+# Cache versions are counters stored in the cache, so every web and worker
+# process must share it; locmem is only allowed for single-process DEBUG runs
+
+REDIS_URL = config('REDIS_URL', default='')
+CACHE_BACKEND = config(
+    'CACHE_BACKEND',
+    default='redis' if REDIS_URL or not DEBUG else 'locmem'
+)
+if CACHE_BACKEND not in ('redis', 'locmem'):
+    raise ImproperlyConfigured(
+        f'Unknown CACHE_BACKEND "{CACHE_BACKEND}", use "redis" or "locmem".'
+    )
+if CACHE_BACKEND == 'locmem' and not DEBUG:
+    raise ImproperlyConfigured(
+        'CACHE_BACKEND "locmem" is not shared between processes, so cache '
+        'version bumps would not reach them. Set REDIS_URL.'
+    )
+
+
+def cache_backend(location, timeout=300, max_entries=None):
+    """
+    Build the configuration of a cache alias for CACHE_BACKEND.
+
+    Redis evicts by its own maxmemory policy, so max_entries
+    only applies to local memory.
+    """
+    if CACHE_BACKEND == 'locmem':
+        options = {'MAX_ENTRIES': max_entries} if max_entries else {}
+        return {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': location,
+            'TIMEOUT': timeout,
+            'OPTIONS': options,
+        }
+    return {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL or 'redis://localhost:6379/0',
+        'KEY_PREFIX': location,
+        'TIMEOUT': timeout,
+    }
+
+
+CACHES = {
+    'default': cache_backend(
+        'default',
+        max_entries=config('DEFAULT_CACHE_MAX_ENTRIES', default=10000, cast=int),
+    ),
+    # AI grading results of individual answers
+    'grading': cache_backend(
+        'grading',
+        timeout=config('GRADING_CACHE_TIMEOUT', default=60 * 60 * 24 * 7, cast=int),
+        max_entries=config('GRADING_CACHE_MAX_ENTRIES', default=10000, cast=int),
+    ),
+    # Generated quizzes, evicted least recently used first once full
+    'quiz_generation': cache_backend(
+        'quiz-generation',
+        timeout=config('QUIZ_GENERATION_CACHE_TIMEOUT', default=60 * 60 * 24, cast=int),
+        max_entries=config('QUIZ_GENERATION_CACHE_MAX_ENTRIES', default=500, cast=int),
+    ),
+    # Responses of views with a CachePolicy
+    'views': cache_backend(
+        'views',
+        max_entries=config('VIEW_CACHE_MAX_ENTRIES', default=5000, cast=int),
+    ),
+    'sessions': cache_backend('sessions', timeout=None),
+}
+
+# Sessions live in the cache when it is shared by all processes,
+# local memory caches are backed by the database
+
+SESSION_ENGINE = config(
+    'SESSION_ENGINE',
+    default=('django.contrib.sessions.backends.cached_db' if CACHE_BACKEND == 'locmem'
+             else 'django.contrib.sessions.backends.cache')
+)
+SESSION_CACHE_ALIAS = 'sessions'
+
+# Lifetime of the responses cached by view cache policies
+
+VIEW_CACHE_TIMEOUT = config('VIEW_CACHE_TIMEOUT', default=5 * 60, cast=int)
+
+# Lifetime of the cached quiz payloads, edits invalidate them immediately
+
+QUIZ_PAYLOAD_CACHE_TIMEOUT = config('QUIZ_PAYLOAD_CACHE_TIMEOUT', default=60 * 60, cast=int)
+
+# Shared OpenAI client connection pool
+
+OPENAI_CLIENT = {
+    'MAX_CONNECTIONS': config('OPENAI_MAX_CONNECTIONS', default=20, cast=int),
+    'MAX_KEEPALIVE_CONNECTIONS': config('OPENAI_MAX_KEEPALIVE_CONNECTIONS', default=10, cast=int),
+    'KEEPALIVE_EXPIRY': config('OPENAI_KEEPALIVE_EXPIRY', default=60.0, cast=float),
+    'CONNECT_TIMEOUT': config('OPENAI_CONNECT_TIMEOUT', default=5.0, cast=float),
+    'TIMEOUT': config('OPENAI_TIMEOUT', default=60.0, cast=float),
+    'MAX_RETRIES': config('OPENAI_MAX_RETRIES', default=2, cast=int),
+}
+
+# Text extraction from uploaded files
+
+FILE_PROCESSOR = {
+    'MAX_PAGES': config('FILE_PROCESSOR_MAX_PAGES', default=500, cast=int),
+    'MAX_CHARS': config('FILE_PROCESSOR_MAX_CHARS', default=200_000, cast=int),
+    # PDFs with at least this many pages are extracted in a process pool
+    'PARALLEL_PAGE_THRESHOLD': config('FILE_PROCESSOR_PARALLEL_PAGE_THRESHOLD', default=50, cast=int),
+    'WORKERS': config('FILE_PROCESSOR_WORKERS', default=0, cast=int),
+}
+
+# Source text sent to the AI model, in estimated tokens
+
+SOURCE_TEXT = {
+    'TOKEN_BUDGET': config('SOURCE_TEXT_TOKEN_BUDGET', default=6000, cast=int),
+    'CHUNK_TOKENS': config('SOURCE_TEXT_CHUNK_TOKENS', default=400, cast=int),
+}
+
+# Map-reduce generation for long uploaded files
+
+MAP_REDUCE = {
+    'MAX_WORKERS': config('MAP_REDUCE_MAX_WORKERS', default=4, cast=int),
+    'SECTION_TOKENS': config('MAP_REDUCE_SECTION_TOKENS', default=4000, cast=int),
+    'MAX_SECTIONS': config('MAP_REDUCE_MAX_SECTIONS', default=10, cast=int),
+}
+
+# Maximum answers graded by the AI model in one call of a batch submission
+
+GRADING_BATCH_SIZE = config('GRADING_BATCH_SIZE', default=25, cast=int)
+
+# Near-duplicate answers share a grading result above this word sequence similarity
+
+GRADING_CACHE = {
+    'SIMILARITY_THRESHOLD': config('GRADING_CACHE_SIMILARITY_THRESHOLD', default=0.9, cast=float),
+    'INDEX_SIZE': config('GRADING_CACHE_INDEX_SIZE', default=200, cast=int),
+}
+
+# Rendered worksheets are kept in MEDIA_ROOT/worksheets up to this size
+
+WORKSHEET_CACHE = {
+    'MAX_BYTES': config('WORKSHEET_CACHE_MAX_BYTES', default=500 * 1024 * 1024, cast=int),
+    'PENDING_TIMEOUT': config('WORKSHEET_PENDING_TIMEOUT', default=5 * 60, cast=int),
+    'WORKERS': config('WORKSHEET_EXPORT_WORKERS', default=4, cast=int),
+}
+
+# Worksheet PDF renderer, "pdfkit" (wkhtmltopdf) or "native" (in-process)
+
+WORKSHEET_RENDERER = config('WORKSHEET_RENDERER', default='pdfkit')
+
 INTERNAL_IPS = [
     "127.0.0.1",
 ]
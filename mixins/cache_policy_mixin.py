@@ -0,0 +1,59 @@
+from typing import Dict
+
+from django.core.cache import caches
+from rest_framework.response import Response
+
+from quiz_app.utils.cache_policy import CacheMetrics, CachePolicy
+
+
+class CachePolicyMixin:
+    """
+    Mixin to cache the responses of the ViewSet actions declared
+    in ``cache_policies``.
+
+    Lookups happen after authentication, permission and throttling
+    checks, so a cached response is never served to a request the
+    view would reject up front.
+    """
+    cache_policies: Dict[str, CachePolicy] = {}
+
+    def initial(self, request, *args, **kwargs):
+        """
+        Serve the response from the cache if the action has a policy.
+        """
+        super().initial(request, *args, **kwargs)
+        self._cache_key = None
+        policy = self.cache_policies.get(self.action)
+        if policy is None or request.method != "GET":
+            return
+
+        key = policy.make_key(self, request)
+        data = caches[CachePolicy.CACHE_ALIAS].get(key)
+        CacheMetrics.record(f"view:{self.basename}.{self.action}",
+                            data is not None)
+        if data is None:
+            self._cache_key = key
+            return
+
+        def cached_handler(*handler_args, **handler_kwargs):
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+        # ViewSets bind their action handlers as instance attributes,
+        # the handler of this request is replaced to serve the hit
+        setattr(self, request.method.lower(), cached_handler)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """
+        Store successful responses of actions with a policy.
+        """
+        key = getattr(self, "_cache_key", None)
+        if key and isinstance(response, Response) \
+                and response.status_code == 200:
+            caches[CachePolicy.CACHE_ALIAS].set(
+                key,
+                response.data,
+                self.cache_policies[self.action].timeout
+            )
+            response["X-Cache"] = "MISS"
+        return super().finalize_response(request, response, *args, **kwargs)
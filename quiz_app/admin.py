@@ -1,5 +1,7 @@
 from django.contrib import admin
-from quiz_app.models import Question, Quiz, Answer, UserAnswer, QuizScore
+from quiz_app.models import (Question, Quiz, Answer, UserAnswer, QuizScore,
+                             QuizGenerationJob)
+from quiz_app.utils.quiz_counters import QuizCounterService
 
 
 @admin.register(Quiz)
@@ -11,6 +13,19 @@ class QuizAdmin(admin.ModelAdmin):
 class QuestionAdmin(admin.ModelAdmin):
     readonly_fields = ('created_at', 'updated_at')
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        QuizCounterService.rebuild([obj.quiz_id])
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        QuizCounterService.rebuild([obj.quiz_id])
+
+    def delete_queryset(self, request, queryset):
+        quiz_ids = list(queryset.values_list("quiz_id", flat=True).distinct())
+        super().delete_queryset(request, queryset)
+        QuizCounterService.rebuild(quiz_ids)
+
 
 @admin.register(Answer)
 class AnswerAdmin(admin.ModelAdmin):
@@ -25,3 +40,8 @@ class UserAnswerAdmin(admin.ModelAdmin):
 @admin.register(QuizScore)
 class QuizScoreAdmin(admin.ModelAdmin):
     readonly_fields = ('created_at', 'updated_at')
+
+
+@admin.register(QuizGenerationJob)
+class QuizGenerationJobAdmin(admin.ModelAdmin):
+    readonly_fields = ('created_at', 'updated_at')
@@ -0,0 +1,135 @@
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+from PyPDF2 import PdfReader, PdfWriter
+
+from quiz_app.utils.file_processor import FileProcessor
+from quiz_app.utils.worksheet_renderers import NativeRenderer
+
+
+class Command(BaseCommand):
+    """
+    Compare in-process and pooled text extraction of PDF uploads.
+    """
+    help = "Compare in-process and pooled text extraction of PDF uploads."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--file",
+            help="PDF file to extract instead of the generated documents."
+        )
+        parser.add_argument(
+            "--pages",
+            type=int,
+            action="append",
+            help="Page count of a generated document, 10, 100 and 500 "
+                 "by default."
+        )
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=5,
+            help="Number of extractions per mode, at least 2."
+        )
+
+    @staticmethod
+    def _generate(path: Path, pages: int) -> None:
+        """
+        Write a PDF of the given page count by repeating a page
+        rendered with the native worksheet renderer.
+
+        :param path: Path of the PDF file.
+        :param pages: Number of pages.
+        """
+        template_path = path.with_suffix(".template.pdf")
+        NativeRenderer().render({
+            "quiz_name": "Benchmark document",
+            "questions": [
+                {
+                    "question": (f"Question {number}: which statement best "
+                                 f"describes the topic of this section?"),
+                    "score": "1.00",
+                    "answers": [
+                        {"answer": f"Answer option {option} of "
+                                   f"question {number}"}
+                        for option in range(1, 5)
+                    ],
+                }
+                for number in range(1, 7)
+            ],
+        }, str(template_path))
+
+        page = PdfReader(template_path).pages[0]
+        writer = PdfWriter()
+        for _ in range(pages):
+            writer.add_page(page)
+        with open(path, "wb") as file:
+            writer.write(file)
+
+    @staticmethod
+    def _extract(path: Path, parallel_threshold: int) -> tuple:
+        """
+        Extract all pages of a PDF.
+
+        :param path: Path of the PDF file.
+        :param parallel_threshold: Page count from which the pool is used.
+
+        :return: Tuple of (latency in milliseconds, extracted characters).
+        """
+        with open(path, "rb") as file:
+            processor = FileProcessor(File(file, name=path.name),
+                                      max_pages=10 ** 6,
+                                      max_chars=10 ** 9)
+            processor.parallel_threshold = parallel_threshold
+            start = time.perf_counter()
+            size = sum(len(text) for text in processor.iter_pdf_pages())
+            return (time.perf_counter() - start) * 1000, size
+
+    def _benchmark(self, path: Path, runs: int) -> None:
+        """
+        Extract a PDF in-process and in the pool and report the latencies.
+
+        :param path: Path of the PDF file.
+        :param runs: Number of extractions per mode.
+        """
+        pages = len(PdfReader(path).pages)
+        for name, threshold in (("in-process", pages + 1), ("pooled", 1)):
+            latencies = []
+            for _ in range(runs):
+                latency, size = self._extract(path, threshold)
+                latencies.append(latency)
+            self.stdout.write(
+                f"{pages} pages {name}: "
+                f"mean {statistics.mean(latencies):.1f} ms, "
+                f"p95 {statistics.quantiles(latencies, n=20)[18]:.1f} ms, "
+                f"{size} characters"
+            )
+
+    def handle(self, *args, **options):
+        runs = options["runs"]
+        if runs < 2:
+            raise CommandError("--runs must be at least 2.")
+
+        with tempfile.TemporaryDirectory() as directory:
+            if options["file"]:
+                path = Path(options["file"])
+                if not path.is_file():
+                    raise CommandError(f"{path} does not exist.")
+                documents = [path]
+            else:
+                documents = []
+                for pages in options["pages"] or [10, 100, 500]:
+                    path = Path(directory) / f"{pages}-pages.pdf"
+                    self._generate(path, pages)
+                    documents.append(path)
+
+            # The first pooled run also pays for starting the workers
+            cold, _ = self._extract(documents[0], parallel_threshold=1)
+            self.stdout.write(f"Pool start-up run {cold:.1f} ms")
+
+            for path in documents:
+                self._benchmark(path, runs)
@@ -0,0 +1,259 @@
+import copy
+import logging
+import statistics
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from quiz_app.utils.quiz_modifier import QuizCreator
+from quiz_app.utils.services import QuizSubmissionCheckerService
+from user.models import User
+from user.views import TakenQuizViewSet
+
+
+class RetryCounter(logging.Handler):
+    """
+    Counts the lock retries logged by ``atomic_with_retry``. The
+    handler lock is held around ``emit``.
+    """
+    def __init__(self) -> None:
+        super().__init__(logging.WARNING)
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.count += 1
+
+
+class Command(BaseCommand):
+    """
+    Simulate simultaneous submissions against the SQLite journal modes.
+    """
+    help = ("Simulate simultaneous submissions with concurrent readers "
+            "against the SQLite rollback journal and WAL.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--submissions",
+            type=int,
+            default=200,
+            help="Number of simultaneous submissions."
+        )
+        parser.add_argument(
+            "--answers",
+            type=int,
+            default=10,
+            help="Answers per submission."
+        )
+        parser.add_argument(
+            "--readers",
+            type=int,
+            default=8,
+            help="Threads listing taken quizzes during the submissions."
+        )
+        parser.add_argument(
+            "--read-interval",
+            type=float,
+            default=0.05,
+            help="Seconds every reader waits between two requests."
+        )
+
+    @contextmanager
+    def _database(self, path: Path, journal_mode: str):
+        """
+        Point the default connection at a new database file, opened
+        with the configured pragmas and the given journal mode.
+
+        :param path: Database file.
+        :param journal_mode: SQLite journal mode.
+        """
+        settings_dict = connections.settings[DEFAULT_DB_ALIAS]
+        saved = copy.deepcopy(settings_dict)
+        pragmas = {**settings.SQLITE_PRAGMAS, "journal_mode": journal_mode}
+
+        connection.close()
+        settings_dict["NAME"] = path
+        settings_dict["OPTIONS"] = {
+            **settings_dict.get("OPTIONS", {}),
+            "init_command": ";".join(
+                f"PRAGMA {name}={value}" for name, value in pragmas.items()
+            ),
+        }
+        try:
+            call_command("migrate", interactive=False, verbosity=0)
+            yield
+        finally:
+            connection.close()
+            settings_dict.clear()
+            settings_dict.update(saved)
+
+    @staticmethod
+    def _seed(options) -> tuple:
+        """
+        Create the quiz and the users submitting it.
+
+        :param options: Command options.
+
+        :return: Tuple of (quiz, users).
+        """
+        creator = User.objects.create(username="creator",
+                                      email="creator@example.com")
+        quiz = QuizCreator({
+            "name": "Benchmark quiz",
+            "questions": [
+                {
+                    "question": f"Question {number}",
+                    "score": 1,
+                    "answers": [
+                        {"answer": f"Answer {number}.{index}",
+                         "correct": index == 0}
+                        for index in range(4)
+                    ],
+                }
+                for number in range(options["answers"])
+            ],
+        }, creator).create()
+        users = User.objects.bulk_create([
+            User(username=f"student-{index}",
+                 email=f"student-{index}@example.com")
+            for index in range(options["submissions"])
+        ])
+        return quiz, users
+
+    def _run(self, options) -> dict:
+        """
+        Run the simulation against the current database. Submissions
+        are saved with the same calls as the check-answers endpoint,
+        and readers call the taken quiz list view.
+
+        :param options: Command options.
+
+        :return: Measurements.
+        """
+        quiz, users = self._seed(options)
+        question_ids = list(quiz.questions.values_list("id", flat=True))
+        factory = APIRequestFactory()
+        list_view = TakenQuizViewSet.as_view({"get": "list"})
+
+        barrier = threading.Barrier(options["submissions"])
+        done = threading.Event()
+        lock = threading.Lock()
+        write_latencies, read_latencies = [], []
+        counters = {"failures": 0}
+
+        def submit(user: User) -> None:
+            request = Request(factory.post("/api/check-answers/"))
+            request.user = user
+            graded_answers = [
+                {"question": q_id, "answer": f"Answer {q_id}",
+                 "explanation": "", "correct": bool(q_id % 2)}
+                for q_id in question_ids
+            ]
+            score = sum(answer["correct"] for answer in graded_answers)
+            barrier.wait()
+            start = time.perf_counter()
+            try:
+                QuizSubmissionCheckerService._save_quiz_score(
+                    quiz.id, score, request, False
+                )
+                QuizSubmissionCheckerService._save_user_answers(
+                    graded_answers, request
+                )
+            except Exception:
+                with lock:
+                    counters["failures"] += 1
+            finally:
+                connection.close()
+            with lock:
+                write_latencies.append(time.perf_counter() - start)
+
+        def read() -> None:
+            index = 0
+            while not done.is_set():
+                request = factory.get("/accounts/taken-quiz/")
+                force_authenticate(request, users[index])
+                start = time.perf_counter()
+                try:
+                    if list_view(request).status_code != 200:
+                        raise RuntimeError("Listing failed")
+                except Exception:
+                    with lock:
+                        counters["failures"] += 1
+                with lock:
+                    read_latencies.append(time.perf_counter() - start)
+                index = (index + 1) % len(users)
+                done.wait(options["read_interval"])
+            connection.close()
+
+        readers = [threading.Thread(target=read)
+                   for _ in range(options["readers"])]
+        writers = [threading.Thread(target=submit, args=(user,))
+                   for user in users]
+        start = time.perf_counter()
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        done.set()
+        for thread in readers:
+            thread.join()
+
+        return {
+            "elapsed": elapsed,
+            "writes": write_latencies,
+            "reads": read_latencies,
+            **counters,
+        }
+
+    @staticmethod
+    def _latencies(values: list) -> str:
+        """
+        Describe latencies by their median and p95.
+
+        :param values: Latencies in seconds.
+
+        :return: Description in milliseconds.
+        """
+        if len(values) < 2:
+            return "too few samples"
+        cuts = statistics.quantiles(values, n=20)
+        return (f"p50 {statistics.median(values) * 1000:.1f} ms "
+                f"p95 {cuts[18] * 1000:.1f} ms")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("The default database is not SQLite.")
+        if options["submissions"] < 1:
+            raise CommandError("--submissions must be at least 1.")
+
+        retries = RetryCounter()
+        retry_logger = logging.getLogger("quiz_app.utils.helpers.db_utils")
+        retry_logger.addHandler(retries)
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                for journal_mode in ("DELETE", "WAL"):
+                    retries.count = 0
+                    path = Path(directory) / f"{journal_mode.lower()}.sqlite3"
+                    with self._database(path, journal_mode):
+                        result = self._run(options)
+                    self.stdout.write(
+                        f"{journal_mode}: "
+                        f"{options['submissions']} submissions in "
+                        f"{result['elapsed']:.2f} s, "
+                        f"write {self._latencies(result['writes'])}, "
+                        f"{len(result['reads'])} reads "
+                        f"{self._latencies(result['reads'])}, "
+                        f"{retries.count} retries, "
+                        f"{result['failures']} failures"
+                    )
+        finally:
+            retry_logger.removeHandler(retries)
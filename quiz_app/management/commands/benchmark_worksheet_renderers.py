@@ -0,0 +1,118 @@
+import resource
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from quiz_app.models import Quiz
+from quiz_app.serializers import QuizSerializer
+from quiz_app.utils.worksheet_renderers import RENDERERS, get_renderer
+
+
+class Command(BaseCommand):
+    """
+    Compare the per-export latency and peak memory of the worksheet renderers.
+    """
+    help = ("Compare the per-export latency and peak memory "
+            "of the worksheet renderers.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--quiz-id",
+            help="ID of the quiz to render, a generated quiz by default."
+        )
+        parser.add_argument(
+            "--questions",
+            type=int,
+            default=20,
+            help="Number of questions of the generated quiz."
+        )
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=20,
+            help="Number of exports per renderer."
+        )
+        parser.add_argument(
+            "--renderer",
+            action="append",
+            choices=sorted(RENDERERS),
+            help="Renderer to benchmark, all renderers by default."
+        )
+
+    @staticmethod
+    def _sample_context(number_of_questions: int) -> dict:
+        """
+        Build the context of a generated quiz.
+
+        :param number_of_questions: Number of questions.
+
+        :return: Worksheet context.
+        """
+        questions = []
+        for number in range(1, number_of_questions + 1):
+            answers = [] if number % 4 == 0 else [
+                {"answer": f"Answer option {option} of question {number}"}
+                for option in range(1, 5)
+            ]
+            questions.append({
+                "question": (f"Question {number}: which statement best "
+                             f"describes the topic of this section?"),
+                "score": "1.00",
+                "answers": answers,
+            })
+        return {"quiz_name": "Benchmark quiz", "questions": questions}
+
+    def _get_context(self, options) -> dict:
+        """
+        Get the context of the rendered quiz.
+
+        :param options: Command options.
+
+        :return: Worksheet context.
+        """
+        if not options["quiz_id"]:
+            return self._sample_context(options["questions"])
+        quiz = Quiz.objects.prefetch_related(
+            "questions__answers"
+        ).filter(id=options["quiz_id"]).first()
+        if quiz is None:
+            raise CommandError(f"Quiz {options['quiz_id']} does not exist.")
+        data = QuizSerializer(quiz).data
+        return {"quiz_name": data.get("name"),
+                "questions": data.get("questions")}
+
+    def handle(self, *args, **options):
+        context = self._get_context(options)
+        runs = options["runs"]
+
+        with tempfile.TemporaryDirectory() as directory:
+            for name in options["renderer"] or sorted(RENDERERS):
+                renderer = get_renderer(name)
+                output_path = str(Path(directory) / f"{name}.pdf")
+                renderer.render(context, output_path)
+
+                latencies = []
+                tracemalloc.start()
+                for _ in range(runs):
+                    start = time.perf_counter()
+                    renderer.render(context, output_path)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                _, python_peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                # ru_maxrss is reported in kilobytes on Linux
+                children_peak = resource.getrusage(
+                    resource.RUSAGE_CHILDREN
+                ).ru_maxrss
+
+                latencies.sort()
+                self.stdout.write(
+                    f"{name}: mean {statistics.mean(latencies):.1f} ms, "
+                    f"p95 {latencies[int(0.95 * (runs - 1))]:.1f} ms, "
+                    f"python peak {python_peak / 1024:.0f} KiB, "
+                    f"subprocess peak {children_peak} KiB, "
+                    f"size {Path(output_path).stat().st_size / 1024:.0f} KiB"
+                )
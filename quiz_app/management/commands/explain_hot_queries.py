@@ -0,0 +1,76 @@
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from quiz_app.models import Quiz, QuizScore, UserAnswer
+
+
+class Command(BaseCommand):
+    """
+    Check that the query plans of the hot queries use their indexes.
+    """
+    help = "Check that the query plans of the hot queries use their indexes."
+
+    @staticmethod
+    def _hot_queries():
+        """
+        Get the hot queries with the index each should use.
+
+        :return: List of (description, queryset, index name).
+        """
+        quiz_id = uuid.uuid4()
+        return [
+            (
+                "Answers of a user to a question",
+                UserAnswer.objects.filter(question_id=1, user_id=1),
+                "useranswer_question_user_idx",
+            ),
+            (
+                "Answers of a guest to a question",
+                UserAnswer.objects.filter(question_id=1, guest="Guest-1"),
+                "useranswer_question_guest_idx",
+            ),
+            (
+                "Scores of a user in a quiz",
+                QuizScore.objects.filter(quiz_id=quiz_id, user_id=1),
+                "quizscore_quiz_user_idx",
+            ),
+            (
+                "Quizzes of a creator by creation time",
+                Quiz.objects.filter(creator_id=1).order_by("created_at"),
+                "quiz_creator_created_idx",
+            ),
+            (
+                "Page of quizzes after a cursor",
+                Quiz.objects.filter(
+                    created_at__gt=timezone.now()
+                ).order_by("created_at", "id")[:7],
+                "quiz_created_id_idx",
+            ),
+        ]
+
+    def handle(self, *args, **options):
+        missing = 0
+        with transaction.atomic():
+            if connection.vendor == "postgresql":
+                # Small tables are scanned sequentially whatever the
+                # indexes, this only checks that the indexes are usable
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+
+            for description, queryset, index_name in self._hot_queries():
+                plan = queryset.explain()
+                if index_name in plan:
+                    self.stdout.write(
+                        self.style.SUCCESS(f"{description}: {index_name}")
+                    )
+                else:
+                    missing += 1
+                    self.stdout.write(self.style.ERROR(
+                        f"{description}: {index_name} not used\n{plan}"
+                    ))
+
+        if missing:
+            raise CommandError(f"{missing} hot queries do not use their index.")
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from quiz_app.utils.quiz_counters import QuizCounterService
+
+
+class Command(BaseCommand):
+    """
+    Rebuild or verify the question count and total score of quizzes.
+    """
+    help = "Rebuild or verify the question count and total score of quizzes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "quiz_ids",
+            nargs="*",
+            help="IDs of the quizzes to process, all quizzes by default."
+        )
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Only report counters which differ from the questions."
+        )
+
+    def handle(self, *args, **options):
+        quiz_ids = options["quiz_ids"] or None
+
+        if options["verify"]:
+            errors = QuizCounterService.verify(quiz_ids)
+            for error in errors:
+                self.stdout.write(self.style.ERROR(error))
+            if errors:
+                self.stdout.write(
+                    self.style.ERROR(f"{len(errors)} quizzes are out of sync.")
+                )
+            else:
+                self.stdout.write(self.style.SUCCESS("All counters are in sync."))
+            return
+
+        updated = QuizCounterService.rebuild(quiz_ids)
+        self.stdout.write(self.style.SUCCESS(f"Counters of {updated} quizzes rebuilt."))
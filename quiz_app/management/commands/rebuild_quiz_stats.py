@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from quiz_app.utils.stats import QuizStatsService
+
+
+class Command(BaseCommand):
+    """
+    Rebuild or verify the quiz and question statistics rollups.
+    """
+    help = "Rebuild or verify the quiz and question statistics rollups."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "quiz_ids",
+            nargs="*",
+            help="IDs of the quizzes to process, all quizzes by default."
+        )
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Only report rollups which differ from the raw data."
+        )
+
+    def handle(self, *args, **options):
+        quiz_ids = options["quiz_ids"] or None
+
+        if options["verify"]:
+            errors = QuizStatsService.verify(quiz_ids)
+            for error in errors:
+                self.stdout.write(self.style.ERROR(error))
+            if errors:
+                self.stdout.write(
+                    self.style.ERROR(f"{len(errors)} rollups are out of sync.")
+                )
+            else:
+                self.stdout.write(self.style.SUCCESS("All rollups are in sync."))
+            return
+
+        QuizStatsService.rebuild(quiz_ids)
+        self.stdout.write(self.style.SUCCESS("Rollups rebuilt."))
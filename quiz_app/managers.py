@@ -1,5 +1,8 @@
+from decimal import Decimal
+
 from django.db import models
-from django.db.models import Case, When, Count, F, Sum, IntegerField
+from django.db.models import (Case, When, Count, F, Q, Sum, IntegerField,
+                              DecimalField, Value)
 
 
 class UserAnswerManager(models.Manager):
@@ -21,6 +24,21 @@ class UserAnswerManager(models.Manager):
         ).distinct()
         return distinct_users.count()
 
+    def with_score(self):
+        """
+        Annotate the answers with their score, computed in SQL, so
+        get_score does not fetch the question of every answer
+
+        :return: Queryset of answers with a points annotation
+        """
+        return self.annotate(
+            points=Case(
+                When(correct=True, then=F("question__score")),
+                default=Value(Decimal("0.00")),
+                output_field=DecimalField(max_digits=5, decimal_places=2)
+            )
+        )
+
     def get_hardest_questions(self, quiz_id):
         """
         Get the hardest questions in the quiz
@@ -56,33 +74,86 @@ class QuizManager(models.Manager):
     """
 
     @staticmethod
-    def get_users_who_took_this_quiz(quiz):
+    def get_users_who_took_this_quiz(quiz, cursor=None, limit=50):
+        """
+        Get a page of the participants of the quiz with their answers.
+
+        Participants are ordered by user ID, followed by guests ordered
+        by name, and paginated with a keyset cursor, so every page
+        costs the same no matter how many participants the quiz has.
+
+        :param quiz: Quiz instance
+        :param cursor: ("user", user_id) or ("guest", guest_name) of the
+        last participant of the previous page, None for the first page
+        :param limit: Maximum number of participants on the page
+
+        :return: Tuple of (participants, cursor of the next page or None)
+        """
         from .models import UserAnswer
 
-        user_answers = (
-            UserAnswer.objects.filter(question__quiz=quiz)
-            .select_related('user', 'question')
+        quiz_answers = UserAnswer.objects.filter(question__quiz=quiz)
+        kind, last_key = cursor or ("user", None)
+        keys = []
+
+        if kind == "user":
+            users = quiz_answers.filter(user__isnull=False)
+            if last_key is not None:
+                users = users.filter(user_id__gt=last_key)
+            keys += [
+                ("user", user_id) for user_id in users.order_by(
+                    "user_id"
+                ).values_list("user_id", flat=True).distinct()[:limit + 1]
+            ]
+            last_key = None
+
+        if len(keys) <= limit:
+            guests = quiz_answers.filter(
+                user__isnull=True, guest__isnull=False
+            )
+            if last_key is not None:
+                guests = guests.filter(guest__gt=last_key)
+            keys += [
+                ("guest", guest) for guest in guests.order_by(
+                    "guest"
+                ).values_list("guest", flat=True).distinct()[
+                    :limit + 1 - len(keys)
+                ]
+            ]
+
+        next_cursor = keys[limit - 1] if len(keys) > limit else None
+        keys = keys[:limit]
+        if not keys:
+            return [], None
+
+        rows = quiz_answers.filter(
+            Q(user_id__in=[key for kind, key in keys if kind == "user"])
+            | Q(
+                user__isnull=True,
+                guest__in=[key for kind, key in keys if kind == "guest"]
+            )
+        ).order_by(
+            "user_id", "guest", "question_id"
+        ).values(
+            "user_id", "user__username", "user__email", "guest",
+            "question_id", "answer", "correct", "explanation"
         )
 
-        if not user_answers:
-            return []
-
         users = {}
-        for answer in user_answers:
+        for row in rows.iterator():
             participant_key = (
-                answer.user.id if answer.user
-                else f"guest-{answer.guest}"
+                ("user", row["user_id"]) if row["user_id"]
+                else ("guest", row["guest"])
             )
 
             if participant_key not in users:
                 user_data = (
                     {
-                        "id": answer.user.id,
-                        "username": answer.user.username,
-                        "email": answer.user.email,
+                        "id": row["user_id"],
+                        "username": row["user__username"],
+                        "email": row["user__email"],
                     }
-                    if answer.user
-                    else {"guest": answer.guest}
+                    if row["user_id"]
+                    else {"guest": row["guest"]}
                 )
                 users[participant_key] = {
                     "user": user_data,
@@ -90,10 +161,10 @@ class QuizManager(models.Manager):
                 }
 
             users[participant_key]["answers"].append({
-                "question_id": answer.question.id,
-                "answer": answer.answer,
-                "correct": answer.correct,
-                "explanation": answer.explanation,
+                "question_id": row["question_id"],
+                "answer": row["answer"],
+                "correct": row["correct"],
+                "explanation": row["explanation"],
             })
 
-        return list(users.values())
+        return [users[key] for key in keys if key in users], next_cursor
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.3 on 2026-10-17 12:00
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0024_alter_quizscore_user'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizGenerationJob',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('generating', 'Generating'), ('persisting', 'Persisting'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=20, verbose_name='Status')),
+                ('creator_input', models.TextField(verbose_name='Creator Input')),
+                ('language', models.CharField(blank=True, max_length=50, null=True, verbose_name='Language')),
+                ('source_text', models.TextField(blank=True, null=True, verbose_name='Source Text')),
+                ('use_cache', models.BooleanField(default=True, verbose_name='Use Cache')),
+                ('error', models.TextField(blank=True, null=True, verbose_name='Error')),
+                ('creator', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='quiz_generation_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Creator')),
+                ('quiz', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='generation_jobs', to='quiz_app.quiz', verbose_name='Quiz')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
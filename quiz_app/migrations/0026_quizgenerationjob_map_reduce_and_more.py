@@ -0,0 +1,23 @@
+# Generated by Django 5.1.3 on 2026-10-17 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0025_quizgenerationjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizgenerationjob',
+            name='map_reduce',
+            field=models.BooleanField(default=False, verbose_name='Map Reduce'),
+        ),
+        migrations.AddField(
+            model_name='quizgenerationjob',
+            name='number_of_questions',
+            field=models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='Number of Questions'),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.1.3 on 2026-10-17 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def populate_stats(apps, schema_editor):
+    QuizScore = apps.get_model('quiz_app', 'QuizScore')
+    UserAnswer = apps.get_model('quiz_app', 'UserAnswer')
+    QuizStats = apps.get_model('quiz_app', 'QuizStats')
+    QuestionStats = apps.get_model('quiz_app', 'QuestionStats')
+
+    QuizStats.objects.bulk_create([
+        QuizStats(
+            quiz_id=row['quiz_id'],
+            attempts=row['attempts'],
+            participants=row['users'] + row['guests'],
+            score_sum=row['score_sum'] or 0,
+        )
+        for row in QuizScore.objects.values('quiz_id').annotate(
+            attempts=Count('id'),
+            users=Count('user', distinct=True),
+            guests=Count('guest', distinct=True),
+            score_sum=Sum('score'),
+        )
+    ])
+    QuestionStats.objects.bulk_create([
+        QuestionStats(
+            question_id=row['question_id'],
+            attempts=row['attempts'],
+            incorrect_count=row['incorrect_count'],
+        )
+        for row in UserAnswer.objects.values('question_id').annotate(
+            attempts=Count('id'),
+            incorrect_count=Count('id', filter=Q(correct=False)),
+        )
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0026_quizgenerationjob_map_reduce_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizStats',
+            fields=[
+                ('quiz', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='quiz_app.quiz', verbose_name='Quiz')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Attempts')),
+                ('participants', models.PositiveIntegerField(default=0, verbose_name='Participants')),
+                ('score_sum', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Score Sum')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='QuestionStats',
+            fields=[
+                ('question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='quiz_app.question', verbose_name='Question')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Attempts')),
+                ('incorrect_count', models.PositiveIntegerField(default=0, verbose_name='Incorrect Count')),
+            ],
+        ),
+        migrations.RunPython(populate_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.3 on 2026-10-17 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0027_quizstats_questionstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizPayload',
+            fields=[
+                ('quiz', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='payload', serialize=False, to='quiz_app.quiz', verbose_name='Quiz')),
+                ('content', models.BinaryField(verbose_name='Content')),
+            ],
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.3 on 2026-10-17 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0028_quizpayload'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['creator', 'created_at'], name='quiz_creator_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='useranswer',
+            index=models.Index(fields=['question', 'user'], name='useranswer_question_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='useranswer',
+            index=models.Index(fields=['question', 'guest'], name='useranswer_question_guest_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quizscore',
+            index=models.Index(fields=['quiz', 'user'], name='quizscore_quiz_user_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.3 on 2026-10-17 12:00
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_counters(apps, schema_editor):
+    Quiz = apps.get_model('quiz_app', 'Quiz')
+    Question = apps.get_model('quiz_app', 'Question')
+
+    questions = Question.objects.filter(quiz=OuterRef('pk')).values('quiz')
+    Quiz.objects.update(
+        question_count=Coalesce(
+            Subquery(questions.annotate(count=Count('id')).values('count')),
+            Value(0)
+        ),
+        total_score=Coalesce(
+            Subquery(questions.annotate(total=Sum('score')).values('total')),
+            Value(Decimal(0)),
+            output_field=models.DecimalField(max_digits=9, decimal_places=2)
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0029_quiz_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='question_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Question Count'),
+        ),
+        migrations.AddField(
+            model_name='quiz',
+            name='total_score',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=9, verbose_name='Total Score'),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
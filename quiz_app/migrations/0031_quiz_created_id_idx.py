@@ -0,0 +1,17 @@
+# Generated by Django 5.1.3 on 2026-10-17 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_app', '0030_quiz_question_count_quiz_total_score'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['created_at', 'id'], name='quiz_created_id_idx'),
+        ),
+    ]
@@ -24,10 +24,30 @@ class Quiz(ModifiedTimeModel):
         related_name="quizzes",
         verbose_name="creator",
     )
+    # Maintained by QuizCreator and QuizUpdater
+    question_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Question Count"
+    )
+    total_score = models.DecimalField(
+        decimal_places=2,
+        max_digits=9,
+        default=0,
+        editable=False,
+        verbose_name="Total Score"
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["creator", "created_at"],
+                         name="quiz_creator_created_idx"),
+            models.Index(fields=["created_at", "id"],
+                         name="quiz_created_id_idx"),
+        ]
 
     def get_total_score(self):
-        total_score = self.questions.aggregate(total=Sum("score"))["total"]
-        return total_score or 0
+        return self.total_score
 
     def __str__(self):
         return f"{self.name}"
@@ -91,10 +111,20 @@ class UserAnswer(ModifiedTimeModel):
 
     objects = UserAnswerManager()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["question", "user"],
+                         name="useranswer_question_user_idx"),
+            models.Index(fields=["question", "guest"],
+                         name="useranswer_question_guest_idx"),
+        ]
+
     def __str__(self):
         return f"{self.answer}"
 
     def get_score(self):
+        if hasattr(self, "points"):
+            return self.points
         if self.correct:
             return self.question.score
         return 0.0
@@ -123,5 +153,135 @@ class QuizScore(ModifiedTimeModel):
     )
     guest = models.CharField(max_length=25, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["quiz", "user"],
+                         name="quizscore_quiz_user_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.score}"
+
+
+class QuizGenerationJob(ModifiedTimeModel):
+    """
+    Tracks a quiz generated in the background by Celery.
+    """
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        GENERATING = "generating", "Generating"
+        PERSISTING = "persisting", "Persisting"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    creator = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="quiz_generation_jobs",
+        verbose_name="Creator"
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.QUEUED,
+        verbose_name="Status"
+    )
+    creator_input = models.TextField(verbose_name="Creator Input")
+    language = models.CharField(
+        max_length=50,
+        null=True,
+        blank=True,
+        verbose_name="Language"
+    )
+    source_text = models.TextField(
+        null=True,
+        blank=True,
+        verbose_name="Source Text"
+    )
+    use_cache = models.BooleanField(default=True, verbose_name="Use Cache")
+    map_reduce = models.BooleanField(default=False, verbose_name="Map Reduce")
+    number_of_questions = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Number of Questions"
+    )
+    quiz = models.ForeignKey(
+        Quiz,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="generation_jobs",
+        verbose_name="Quiz"
+    )
+    error = models.TextField(null=True, blank=True, verbose_name="Error")
+
+    def __str__(self):
+        return f"{self.id} ({self.status})"
+
+
+class QuizStats(models.Model):
+    """
+    Rollup of the submissions of a quiz, maintained on every submission.
+    """
+    quiz = models.OneToOneField(
+        Quiz,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+        verbose_name="Quiz"
+    )
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Attempts")
+    participants = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Participants"
+    )
+    score_sum = models.DecimalField(
+        decimal_places=2,
+        max_digits=12,
+        default=0,
+        verbose_name="Score Sum"
+    )
+
+    def __str__(self):
+        return f"{self.quiz_id}: {self.participants}"
+
+
+class QuestionStats(models.Model):
+    """
+    Rollup of the answers given to a question, maintained on every
+    submission.
+    """
+    question = models.OneToOneField(
+        Question,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+        verbose_name="Question"
+    )
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Attempts")
+    incorrect_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Incorrect Count"
+    )
+
+    def __str__(self):
+        return f"{self.question_id}: {self.incorrect_count}/{self.attempts}"
+
+
+class QuizPayload(models.Model):
+    """
+    Student view of a quiz without the correct answers, pre-rendered
+    as JSON whenever the quiz is created or updated.
+    """
+    quiz = models.OneToOneField(
+        Quiz,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="payload",
+        verbose_name="Quiz"
+    )
+    content = models.BinaryField(verbose_name="Content")
+
     def __str__(self):
-        return f"{self.score}"
\ No newline at end of file
+        return f"{self.quiz_id}"
@@ -54,6 +54,9 @@ class InputSerializer(serializers.Serializer):
     topic_in_preferred_language = serializers.CharField(max_length=150, required=False)
     file = serializers.FileField(required=False)
     language = serializers.CharField(max_length=50, required=False)
+    use_cache = serializers.BooleanField(default=True, required=False)
+    async_mode = serializers.BooleanField(default=False, required=False)
+    map_reduce = serializers.BooleanField(default=False, required=False)
 
     def validate(self, data):
         """
@@ -77,6 +80,10 @@ class InputSerializer(serializers.Serializer):
             raise serializers.ValidationError(
                 "Language should not be provided when file is uploaded"
             )
+        if data.get("map_reduce") and not file:
+            raise serializers.ValidationError(
+                "Map-reduce generation requires an uploaded file"
+            )
         if number_of_questions > 10 or number_of_questions < 1:
             raise serializers.ValidationError(
                 "Number of questions should be greater than 1 and less than 10"
@@ -89,6 +96,17 @@ class InputSerializer(serializers.Serializer):
         return data
 
 
+class QuizGenerationJobSerializer(serializers.ModelSerializer):
+    """
+    Serializer for background quiz generation jobs
+    """
+    quiz = QuizSerializer(read_only=True)
+
+    class Meta:
+        model = QuizGenerationJob
+        fields = ["id", "status", "error", "quiz", "created_at", "updated_at"]
+
+
 class AnswerItemSerializer(serializers.Serializer):
     """
     Serializer for individual answer items within the submission.
@@ -133,3 +151,18 @@ class AnswerCheckerSerializer(serializers.Serializer):
             if normalized_username == "tornike":
                 raise DenyTornikeException()
         return super().validate(data)
+
+
+class BatchAnswerCheckerSerializer(serializers.Serializer):
+    """
+    Serializer for checking many submissions in one request
+    """
+    submissions = serializers.ListField(
+        child=AnswerCheckerSerializer(),
+        min_length=1,
+        max_length=100,
+        error_messages={
+            'min_length': 'At least one submission must be provided',
+            'empty': 'No submissions provided'
+        }
+    )
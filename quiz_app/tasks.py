@@ -19,3 +19,41 @@ def send_email(subject: str, message: str, to: list) -> None:
         to=to
     )
     mail.send(fail_silently=False)
+
+
+@shared_task
+def generate_quiz_job(job_id: str) -> None:
+    """
+    Generate and persist the quiz of a background generation job
+
+    :param job_id: ID of the QuizGenerationJob
+    """
+    from quiz_app.utils.services import QuizGenerationJobService
+
+    QuizGenerationJobService.run(job_id)
+
+
+@shared_task
+def render_worksheet(data: dict, name: str) -> None:
+    """
+    Render a worksheet artifact of a quiz
+
+    :param data: Serialized quiz data
+    :param name: Artifact file name
+    """
+    from quiz_app.utils.worksheet import WorksheetArtifactStore
+
+    WorksheetArtifactStore().render(data, name)
+
+
+@shared_task
+def render_worksheet_archive(quizzes: list, name: str) -> None:
+    """
+    Render a ZIP archive with the worksheets of many quizzes
+
+    :param quizzes: Serialized data of every quiz
+    :param name: Archive file name
+    """
+    from quiz_app.utils.worksheet import WorksheetArtifactStore
+
+    WorksheetArtifactStore().render_archive(quizzes, name)
@@ -8,8 +8,10 @@ router = DefaultRouter()
 
 router.register(r"quiz", QuizViewSet, basename="quiz")
 router.register("check-answers", CheckAnswersViewSet, basename="check-answers")
+router.register(r"quiz-jobs", QuizGenerationJobViewSet, basename="quiz-jobs")
 
 
 urlpatterns = [
     path("", include(router.urls)),
+    path("cache-metrics/", CacheMetricsView.as_view(), name="cache-metrics"),
 ]
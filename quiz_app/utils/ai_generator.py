@@ -1,13 +1,12 @@
 import logging
 
-from typing import Type, Optional, Dict
-from decouple import config  # type: ignore
-from openai import OpenAI
+from typing import Type, Optional, Dict, Iterator, Tuple
 from pydantic import BaseModel
 
 from exceptions.custom_exceptions import QuizGenerationError
-from quiz_app.utils.pydantic_models import Quiz
+from quiz_app.utils.pydantic_models import Quiz, Question
 from quiz_app.utils.pydantic_models import QuizAnswers
+from quiz_app.utils.openai_client import OpenAIClientRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -17,9 +16,11 @@ class QuizGenerator:
     This class is used to generate quiz questions and
     check answers using OpenAI API.
     """
+    MODEL = "gpt-4o-mini"
+    TEMPERATURE = 0.8
+
     def __init__(self):
-        self.__API_KEY = config('OPEN_AI_SECRET_KEY')
-        self.__client = OpenAI(api_key=self.__API_KEY)
+        self.__client = OpenAIClientRegistry.get_client()
 
     def use_ai(self,
                sys_prompt: str,
@@ -38,19 +39,40 @@ class QuizGenerator:
         """
         try:
             completion = self.__client.beta.chat.completions.parse(
-                model="gpt-4o-mini",
+                model=self.MODEL,
                 messages=[
                     {"role": "system", "content": sys_prompt},
                     {"role": "user", "content": prompt}
                 ],
                 response_format=response_format,
-                temperature=0.8,
+                temperature=self.TEMPERATURE,
             )
+            OpenAIClientRegistry.log_metrics()
             return completion.choices[0].message.parsed
         except Exception as e:
             logger.error(f"OpenAI API error: {str(e)}", exc_info=True)
             raise QuizGenerationError(f"Failed to generate content: {str(e)}")
 
+    @staticmethod
+    def _build_quiz_prompt(language: str, file: Optional[str] = None) -> str:
+        """
+        Build the system prompt for quiz generation.
+
+        :param language: Language for the quiz questions.
+        :param file: File to use for generating questions.
+
+        :return: System prompt.
+        """
+        sys_prompt = (f"Please generate a quiz in the required format."
+                      f"Scores should be 1.00 by default. "
+                      f"if the question is open-ended, "
+                      f"the answers list should be empty."
+                      f"Language should be {language}")
+
+        if file is not None:
+            sys_prompt += f"Use this text for generating questions {file}"
+        return sys_prompt
+
     def generate_quiz(self,
                       prompt: str,
                       language:str,
@@ -66,14 +88,7 @@ class QuizGenerator:
 
         :raises QuizGenerationError: If the AI model fails to generate content.
         """
-        sys_prompt = (f"Please generate a quiz in the required format."
-                      f"Scores should be 1.00 by default. "
-                      f"if the question is open-ended, "
-                      f"the answers list should be empty."
-                      f"Language should be {language}")
-
-        if file is not None:
-            sys_prompt += f"Use this text for generating questions {file}"
+        sys_prompt = self._build_quiz_prompt(language, file)
 
         try:
             raw_response = self.use_ai(sys_prompt, prompt, Quiz)
@@ -87,6 +102,61 @@ class QuizGenerator:
             logger.error(f"Quiz generation error: {str(e)}", exc_info=True)
             raise QuizGenerationError(f"Failed to generate quiz: {str(e)}")
 
+    def stream_quiz(self,
+                    prompt: str,
+                    language: str,
+                    file: Optional[str] = None) -> Iterator[Tuple[str, Dict]]:
+        """
+        Generate a quiz using the AI model, yielding every question
+        as soon as the model has finished writing it.
+
+        :param prompt: User prompt for the AI model.
+        :param language: Language for the quiz questions.
+        :param file: File to use for generating questions.
+
+        :return: Iterator of ("question", question) events followed
+        by a single ("quiz", quiz) event with the complete quiz.
+
+        :raises QuizGenerationError: If the AI model fails to generate content.
+        """
+        sys_prompt = self._build_quiz_prompt(language, file)
+        emitted = 0
+
+        try:
+            with self.__client.beta.chat.completions.stream(
+                model=self.MODEL,
+                messages=[
+                    {"role": "system", "content": sys_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                response_format=Quiz,
+                temperature=self.TEMPERATURE,
+            ) as stream:
+                for event in stream:
+                    if event.type != "content.delta" or not event.parsed:
+                        continue
+                    # Every question but the last one is complete
+                    questions = event.parsed.get("questions") or []
+                    while emitted < len(questions) - 1:
+                        question = Question.model_validate(questions[emitted])
+                        yield "question", question.model_dump()
+                        emitted += 1
+                completion = stream.get_final_completion()
+
+            raw_response = completion.choices[0].message.parsed
+            if not raw_response:
+                raise QuizGenerationError("Received empty response from AI")
+
+            for question in raw_response.questions[emitted:]:
+                yield "question", question.model_dump()
+            yield "quiz", raw_response.model_dump()
+
+        except QuizGenerationError:
+            raise
+        except Exception as e:
+            logger.error(f"Quiz streaming error: {str(e)}", exc_info=True)
+            raise QuizGenerationError(f"Failed to generate quiz: {str(e)}")
+
     def check_answers(self, exp_language: str, prompt: str) -> Dict:
         """
         Check the answers to a quiz using the AI model.
@@ -0,0 +1,156 @@
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, Tuple
+
+from django.core.cache import caches
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+class CacheVersion:
+    """
+    Version counters of cached objects.
+
+    Cache keys include the versions of the objects they depend on,
+    so bumping a version orphans every entry built from the old
+    state instead of deleting them one by one.
+    """
+    CACHE_ALIAS = "default"
+    KEY_PREFIX = "version"
+
+    @classmethod
+    def get_many(cls, scopes: Iterable[str]) -> Dict[str, int]:
+        """
+        Get the current versions of scopes.
+
+        :param scopes: Version scopes, e.g. ``quiz:<id>``.
+
+        :return: Versions mapped by scope.
+        """
+        keys = {f"{cls.KEY_PREFIX}:{scope}": scope for scope in scopes}
+        stored = caches[cls.CACHE_ALIAS].get_many(keys.keys())
+        return {scope: stored.get(key, 0) for key, scope in keys.items()}
+
+    @classmethod
+    def bump(cls, *scopes: str) -> None:
+        """
+        Bump the versions of scopes once the transaction is committed.
+
+        :param scopes: Version scopes.
+        """
+        def _bump() -> None:
+            cache = caches[cls.CACHE_ALIAS]
+            for scope in scopes:
+                key = f"{cls.KEY_PREFIX}:{scope}"
+                cache.add(key, 0, timeout=None)
+                try:
+                    cache.incr(key)
+                except ValueError:
+                    # Evicted between add and incr
+                    cache.set(key, 1, timeout=None)
+
+        if scopes:
+            transaction.on_commit(_bump)
+
+
+class CacheMetrics:
+    """
+    Hit and miss counters of named caches, shared by all processes
+    through the default cache.
+    """
+    CACHE_ALIAS = "default"
+    KEY_PREFIX = "cache-metrics"
+    NAMES_KEY = f"{KEY_PREFIX}:names"
+
+    @classmethod
+    def record(cls, name: str, hit: bool, count: int = 1) -> None:
+        """
+        Count lookups.
+
+        :param name: Name of the cache or cached view.
+        :param hit: Whether the lookups were hits.
+        :param count: Number of lookups.
+        """
+        if count <= 0:
+            return
+        cache = caches[cls.CACHE_ALIAS]
+        key = f"{cls.KEY_PREFIX}:{name}:{'hits' if hit else 'misses'}"
+        try:
+            if cache.add(key, count, timeout=None):
+                names = cache.get(cls.NAMES_KEY, set())
+                if name not in names:
+                    cache.set(cls.NAMES_KEY, names | {name}, timeout=None)
+            else:
+                cache.incr(key, count)
+        except Exception as e:
+            logger.warning(f"Failed to record cache metrics: {str(e)}")
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, Dict[str, float]]:
+        """
+        Get the counters of every cache.
+
+        :return: Hits, misses and hit ratio mapped by cache name.
+        """
+        cache = caches[cls.CACHE_ALIAS]
+        names = sorted(cache.get(cls.NAMES_KEY, set()))
+        counters = cache.get_many([
+            f"{cls.KEY_PREFIX}:{name}:{kind}"
+            for name in names for kind in ("hits", "misses")
+        ])
+        metrics = {}
+        for name in names:
+            hits = counters.get(f"{cls.KEY_PREFIX}:{name}:hits", 0)
+            misses = counters.get(f"{cls.KEY_PREFIX}:{name}:misses", 0)
+            metrics[name] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": hits / (hits + misses) if hits + misses else 0.0,
+            }
+        return metrics
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    Cache policy of a view action.
+
+    :param timeout: Lifetime of the cached responses in seconds.
+    :param vary_on_user: Whether every user gets their own entries.
+    Must be set for responses which depend on the user or on object
+    permissions, since permissions are not checked again on a hit.
+    :param versions: Version scopes the response depends on, as format
+    strings over the URL kwargs and ``user``, e.g. ``"quiz:{pk}"``.
+    """
+    timeout: int
+    vary_on_user: bool = True
+    versions: Tuple[str, ...] = ()
+
+    CACHE_ALIAS = "views"
+
+    def make_key(self, view, request) -> str:
+        """
+        Build the cache key of a request.
+
+        :param view: View instance.
+        :param request: Request object.
+
+        :return: Cache key.
+        """
+        user = request.user
+        scopes = [
+            scope.format(user=user, **view.kwargs) for scope in self.versions
+        ]
+        versions = CacheVersion.get_many(scopes)
+        user_key = "*"
+        if self.vary_on_user:
+            user_key = user.pk if user.is_authenticated else "anonymous"
+        accept = request.accepted_renderer.format
+        digest = hashlib.sha256(
+            request.get_full_path().encode("utf-8")
+        ).hexdigest()[:32]
+        version_key = ",".join(f"{versions[scope]}" for scope in scopes)
+        return (f"view:{view.basename}:{view.action}:{user_key}:"
+                f"{version_key}:{accept}:{digest}")
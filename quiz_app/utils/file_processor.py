@@ -1,13 +1,91 @@
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, List, Optional, Tuple
+
+from django.conf import settings
 from PyPDF2 import PdfReader
 from docx2txt import docx2txt  # type: ignore
 
+logger = logging.getLogger(__name__)
+
+# Shared by all uploads of the process, see _get_pdf_pool
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+_pdf_pool_lock = threading.Lock()
+
+# Last PDF opened by a worker process, as (path, reader)
+_worker_document: Optional[Tuple[str, PdfReader]] = None
+
+
+def _get_pdf_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Get the process pool for PDF extraction, creating it on first use.
+
+    Workers are started with spawn, since forking a threaded web
+    worker can copy held locks into the child.
+
+    :param workers: Number of worker processes.
+    :return: Process pool.
+    """
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            _pdf_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pdf_pool
+
+
+def _reset_pdf_pool() -> None:
+    """
+    Drop a broken process pool so the next upload creates a new one.
+    """
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is not None:
+            _pdf_pool.shutdown(wait=False, cancel_futures=True)
+        _pdf_pool = None
+
+
+def _extract_pdf_pages(path: str, start: int, end: int) -> List[str]:
+    """
+    Extract the text of a range of pages in a worker process. The
+    reader is kept for the following batches of the same document.
+
+    :param path: Path of the PDF file.
+    :param start: Index of the first page.
+    :param end: Index after the last page.
+    :return: Texts of the pages.
+    """
+    global _worker_document
+    if _worker_document is None or _worker_document[0] != path:
+        _worker_document = (path, PdfReader(path))
+    reader = _worker_document[1]
+    return [
+        reader.pages[number].extract_text() or ""
+        for number in range(start, end)
+    ]
+
 
 class FileProcessor:
     """
     Class to process files and extract text from them
     """
-    def __init__(self, file):
+    def __init__(self,
+                 file,
+                 max_pages: Optional[int] = None,
+                 max_chars: Optional[int] = None):
+        options = getattr(settings, "FILE_PROCESSOR", {})
         self.file = file
+        self.max_pages = max_pages or options.get("MAX_PAGES", 500)
+        self.max_chars = max_chars or options.get("MAX_CHARS", 200_000)
+        self.parallel_threshold = options.get("PARALLEL_PAGE_THRESHOLD", 50)
+        self.workers = options.get("WORKERS") or os.cpu_count() or 1
 
     def process_file(self):
         text = ""
@@ -23,15 +101,81 @@ class FileProcessor:
         :return: text extracted from docx files
         """
         text = docx2txt.process(self.file)
-        return text
+        return text[:self.max_chars]
 
     def _process_pdfs(self):
         """
-        Process PDF files
+        Process PDF files, stopping once enough text has been collected
         :return: text extracted from PDF files
         """
-        text = ""
+        parts = []
+        size = 0
+        for text in self.iter_pdf_pages():
+            parts.append(text)
+            size += len(text)
+            if size >= self.max_chars:
+                break
+        return "".join(parts)[:self.max_chars]
+
+    def iter_pdf_pages(self) -> Iterator[str]:
+        """
+        Yield the text of PDF pages in order. Large documents are
+        extracted in batches across the shared process pool.
+        :return: iterator of page texts
+        """
         reader = PdfReader(self.file)
-        for page in reader.pages:
-            text += page.extract_text()
-        return text
+        page_count = min(len(reader.pages), self.max_pages)
+
+        if page_count < self.parallel_threshold:
+            for page in reader.pages[:page_count]:
+                yield page.extract_text() or ""
+            return
+
+        self.file.seek(0)
+        with tempfile.NamedTemporaryFile(suffix=".pdf") as document:
+            document.write(self.file.read())
+            document.flush()
+            extracted = 0
+            try:
+                for text in self._iter_pool_pages(document.name, page_count):
+                    extracted += 1
+                    yield text
+            except BrokenProcessPool:
+                logger.warning("PDF extraction pool broke, extracting "
+                               "the remaining pages in-process")
+                _reset_pdf_pool()
+                for page in reader.pages[extracted:page_count]:
+                    yield page.extract_text() or ""
+
+    def _iter_pool_pages(self, path: str, page_count: int) -> Iterator[str]:
+        """
+        Extract pages in the process pool, keeping a few batches in
+        flight ahead of the consumer.
+
+        :param path: Path of the PDF file.
+        :param page_count: Number of pages to extract.
+        :return: iterator of page texts
+        """
+        pool = _get_pdf_pool(self.workers)
+        batch_size = 8
+        batches = iter(range(0, page_count, batch_size))
+        pending = []
+
+        def submit() -> None:
+            start = next(batches, None)
+            if start is not None:
+                pending.append(pool.submit(
+                    _extract_pdf_pages, path, start,
+                    min(start + batch_size, page_count)
+                ))
+
+        try:
+            for _ in range(self.workers * 2):
+                submit()
+            while pending:
+                texts = pending.pop(0).result()
+                submit()
+                yield from texts
+        finally:
+            for future in pending:
+                future.cancel()
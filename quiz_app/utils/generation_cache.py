@@ -0,0 +1,93 @@
+import hashlib
+import json
+import logging
+import re
+from typing import Optional
+
+from django.core.cache import caches
+
+from quiz_app.utils.ai_generator import QuizGenerator
+from quiz_app.utils.cache_policy import CacheMetrics
+
+logger = logging.getLogger(__name__)
+
+
+class GenerationCache:
+    """
+    Content-addressed cache for generated quizzes.
+
+    Entries are keyed on a hash of the normalized creator input,
+    language, source text and the model parameters, so a retry of
+    the same request is served without calling the AI model.
+    """
+    CACHE_ALIAS = "quiz_generation"
+    KEY_PREFIX = "quiz-generation"
+
+    def __init__(self) -> None:
+        self.cache = caches[self.CACHE_ALIAS]
+
+    @staticmethod
+    def _normalize(text: Optional[str]) -> str:
+        """
+        Normalize text so insignificant differences share a key.
+
+        :param text: Text to normalize.
+
+        :return: Normalized text.
+        """
+        if not text:
+            return ""
+        return re.sub(r"\s+", " ", text).strip().casefold()
+
+    def make_key(self,
+                 creator_input: str,
+                 language: Optional[str],
+                 text: Optional[str] = None,
+                 map_reduce: bool = False) -> str:
+        """
+        Build the cache key for a generation request.
+
+        :param creator_input: User input for quiz generation.
+        :param language: Language for quiz generation.
+        :param text: Text content for quiz generation.
+        :param map_reduce: Whether the quiz is generated section by section.
+
+        :return: Cache key.
+        """
+        text_hash = hashlib.sha256(
+            self._normalize(text).encode("utf-8")
+        ).hexdigest()
+        payload = json.dumps({
+            "creator_input": self._normalize(creator_input),
+            "language": self._normalize(language),
+            "text": text_hash,
+            "model": QuizGenerator.MODEL,
+            "temperature": QuizGenerator.TEMPERATURE,
+            "map_reduce": map_reduce,
+        }, sort_keys=True)
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return f"{self.KEY_PREFIX}:{digest}"
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Get a cached quiz.
+
+        :param key: Cache key.
+
+        :return: Quiz data or None on a miss.
+        """
+        quiz_data = self.cache.get(key)
+        CacheMetrics.record(self.CACHE_ALIAS, quiz_data is not None)
+        if quiz_data is not None:
+            logger.info(f"Quiz generation cache hit: {key}")
+        return quiz_data
+
+    def set(self, key: str, quiz_data: dict) -> None:
+        """
+        Store a generated quiz. Expiry and eviction are
+        handled by the cache backend.
+
+        :param key: Cache key.
+        :param quiz_data: Quiz data.
+        """
+        self.cache.set(key, quiz_data)
@@ -0,0 +1,328 @@
+import logging
+import re
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+
+from exceptions.custom_exceptions import QuizGenerationError
+from quiz_app.models import Question, Quiz
+from quiz_app.utils.ai_generator import QuizGenerator
+from quiz_app.utils.grading_cache import GradingCache
+
+logger = logging.getLogger(__name__)
+
+
+class SubmissionGrader:
+    """
+    Grades quiz submissions locally wherever the answer key is known.
+
+    Multiple choice questions are scored against ``Answer.correct``
+    without leaving the process. The AI model is only asked about
+    open-ended questions and about wrong multiple choice answers,
+    which still need an explanation.
+    """
+    def __init__(self,
+                 answer_data: List[Dict],
+                 questions: Optional[Dict[int, Question]] = None) -> None:
+        """
+        Initialize the grader and load the submitted questions.
+
+        :param answer_data: Submitted answer items.
+        :param questions: Already loaded questions mapped by ID, they
+        are loaded from the database if not given.
+
+        :raises ValidationError: If the questions are unknown or
+        belong to different quizzes.
+        """
+        self.answer_data = answer_data
+        question_ids: Set[int] = {
+            item.get("question_id") for item in answer_data
+        }
+        if questions is None:
+            questions = self.load_questions(question_ids)
+        self.questions: Dict[int, Question] = {
+            q_id: questions[q_id] for q_id in question_ids if q_id in questions
+        }
+
+        invalid_ids = question_ids - set(self.questions.keys())
+        if invalid_ids:
+            raise ValidationError(f"Invalid question IDs: {invalid_ids}")
+        if len({q.quiz_id for q in self.questions.values()}) > 1:
+            raise ValidationError("All answers must belong to the same quiz")
+
+        self.graded: Dict[int, Dict] = {}
+        self.error: Optional[str] = None
+
+    @staticmethod
+    def load_questions(question_ids: Iterable[int]) -> Dict[int, Question]:
+        """
+        Load questions with their quiz and answer key.
+
+        :param question_ids: IDs of the questions.
+
+        :return: Questions mapped by ID.
+        """
+        return {
+            question.id: question
+            for question in Question.objects.filter(
+                id__in=set(question_ids)
+            ).select_related(
+                "quiz__creator"
+            ).prefetch_related("answers")
+        }
+
+    @property
+    def quiz(self) -> Quiz:
+        """
+        The quiz the submission belongs to.
+        """
+        return next(iter(self.questions.values())).quiz
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """
+        Normalize answer text for comparison.
+
+        :param text: Answer text.
+
+        :return: Normalized text.
+        """
+        return re.sub(r"\s+", " ", str(text)).strip().casefold()
+
+    def grade(self, language: str) -> Dict:
+        """
+        Grade the submission.
+
+        :param language: Language for the explanation field.
+
+        :return: Graded answers and the total score, in the same
+        format as ``QuizGenerator.check_answers``.
+        """
+        BatchGrader().grade([(self, language)])
+        if self.error:
+            raise QuizGenerationError(self.error)
+        return self.result()
+
+    def grade_locally(self) -> List[Dict]:
+        """
+        Grade the multiple choice answers.
+
+        :return: Answer items which still need the AI model.
+        """
+        pending: List[Dict] = []
+
+        for item in self.answer_data:
+            question_id = item.get("question_id")
+            choices = list(self.questions[question_id].answers.all())
+            if not choices:
+                # Open-ended question, only the AI model can grade it
+                pending.append(item)
+                continue
+
+            correct_answers = [a.answer for a in choices if a.correct]
+            correct = self._normalize(item.get("answer")) in {
+                self._normalize(answer) for answer in correct_answers
+            }
+            self.graded[question_id] = {
+                "question": question_id,
+                "answer": item.get("answer"),
+                "explanation": "",
+                "correct": correct,
+            }
+            if not correct:
+                pending.append({**item, "correct_answers": correct_answers})
+        return pending
+
+    def apply_ai_results(self,
+                         pending: List[Dict],
+                         ai_answers: Dict[int, Dict]) -> None:
+        """
+        Apply the AI model results to the pending answer items.
+
+        :param pending: Answer items returned by ``grade_locally``.
+        :param ai_answers: AI model results mapped by question ID.
+        """
+        for item in pending:
+            question_id = item.get("question_id")
+            result = ai_answers.get(question_id, {})
+            explanation = result.get("explanation") or ""
+
+            if question_id in self.graded:
+                # Local verdict stands, only the explanation is used
+                self.graded[question_id]["explanation"] = explanation
+                continue
+
+            if not result:
+                logger.warning(
+                    f"AI model did not grade question {question_id}"
+                )
+            self.graded[question_id] = {
+                "question": question_id,
+                "answer": item.get("answer"),
+                "explanation": explanation,
+                "correct": bool(result.get("correct", False)),
+            }
+
+    def result(self) -> Dict:
+        """
+        Collect the graded answers.
+
+        :return: Graded answers and the total score.
+        """
+        answers = [
+            self.graded[item.get("question_id")] for item in self.answer_data
+        ]
+        total_score = sum(
+            (self.questions[answer["question"]].score
+             for answer in answers if answer["correct"]),
+            Decimal(0)
+        )
+        return {
+            "answers": answers,
+            "user_total_score": float(total_score),
+        }
+
+
+class BatchGrader:
+    """
+    Grades many submissions together.
+
+    Pending answer items of all submissions are packed into a few
+    AI model calls, grouped by explanation language.
+    """
+    def __init__(self, batch_size: Optional[int] = None) -> None:
+        """
+        Initialize the batch grader.
+
+        :param batch_size: Maximum answer items per AI model call,
+        ``GRADING_BATCH_SIZE`` setting by default.
+        """
+        self.batch_size = batch_size or getattr(
+            settings, "GRADING_BATCH_SIZE", 25
+        )
+
+    def grade(self, graders: List[Tuple[SubmissionGrader, str]]) -> None:
+        """
+        Grade the submissions. Results are collected on every grader.
+
+        :param graders: Tuples of (grader, explanation language).
+        """
+        by_language: Dict[str, List[Tuple[SubmissionGrader, Dict]]] = {}
+        for grader, language in graders:
+            for item in grader.grade_locally():
+                by_language.setdefault(language, []).append((grader, item))
+
+        grading_cache = GradingCache()
+        for language, items in by_language.items():
+            items = self._apply_cached(grading_cache, items, language)
+            for start in range(0, len(items), self.batch_size):
+                batch = items[start:start + self.batch_size]
+                try:
+                    self._grade_batch(grading_cache, batch, language)
+                except QuizGenerationError as e:
+                    for grader, _ in batch:
+                        grader.error = str(e)
+
+    @staticmethod
+    def _apply_cached(grading_cache: GradingCache,
+                      items: List[Tuple[SubmissionGrader, Dict]],
+                      language: str
+                      ) -> List[Tuple[SubmissionGrader, Dict]]:
+        """
+        Apply cached results of earlier identical or similar answers.
+
+        :param grading_cache: Grading cache.
+        :param items: Tuples of (grader, pending answer item).
+        :param language: Language for the explanation field.
+
+        :return: Items which still need the AI model.
+        """
+        cached = grading_cache.lookup(
+            [grader.questions[item.get("question_id")]
+             for grader, item in items],
+            [item.get("answer") for _, item in items],
+            language
+        )
+        misses = []
+        for (grader, item), result in zip(items, cached):
+            if result is None:
+                misses.append((grader, item))
+            else:
+                grader.apply_ai_results(
+                    [item], {item.get("question_id"): result}
+                )
+        return misses
+
+    @staticmethod
+    def _prompt_item(question: Question, answer: str, position: int) -> Dict:
+        """
+        Build the prompt item of an answer from the stored question.
+
+        :param question: Question from the database.
+        :param answer: Submitted answer text.
+        :param position: Position of the item in the batch.
+
+        :return: Prompt item.
+        """
+        prompt_item = {
+            "question_id": position,
+            "question": question.question,
+            "answer": answer,
+        }
+        correct_answers = [
+            choice.answer for choice in question.answers.all()
+            if choice.correct
+        ]
+        if correct_answers:
+            prompt_item["correct_answers"] = correct_answers
+        return prompt_item
+
+    @staticmethod
+    def _grade_batch(grading_cache: GradingCache,
+                     items: List[Tuple[SubmissionGrader, Dict]],
+                     language: str) -> None:
+        """
+        Grade one packed batch with a single AI model call.
+
+        The same question can appear in many submissions, so every
+        item is sent under its position in the batch as its ID. The
+        question text and answer key come from the database, only the
+        answer is taken from the submission, since the verdict is
+        cached for every later student.
+
+        :param grading_cache: Grading cache for the results.
+        :param items: Tuples of (grader, pending answer item).
+        :param language: Language for the explanation field.
+        """
+        prompt_items = [
+            BatchGrader._prompt_item(
+                grader.questions[item.get("question_id")],
+                item.get("answer"),
+                position
+            )
+            for position, (grader, item) in enumerate(items, start=1)
+        ]
+        results = QuizGenerator().check_answers(language, str(prompt_items))
+        ai_answers = {
+            result.get("question"): result
+            for result in results.get("answers", [])
+        }
+
+        graded_items = []
+        for position, (grader, item) in enumerate(items, start=1):
+            result = ai_answers.get(position, {})
+            grader.apply_ai_results(
+                [item], {item.get("question_id"): result}
+            )
+            if result:
+                graded_items.append((grader, item, result))
+
+        grading_cache.store(
+            [grader.questions[item.get("question_id")]
+             for grader, item, _ in graded_items],
+            [item.get("answer") for _, item, _ in graded_items],
+            [result for _, _, result in graded_items],
+            language
+        )
@@ -0,0 +1,260 @@
+import hashlib
+import logging
+import re
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+from quiz_app.models import Question
+from quiz_app.utils.cache_policy import CacheMetrics
+
+logger = logging.getLogger(__name__)
+
+# Words which flip the meaning of an answer when added or removed
+NEGATIONS = frozenset({
+    "not", "no", "never", "none", "nothing", "nobody", "neither", "nor",
+    "cannot", "without", "t",
+})
+
+
+class GradingCache:
+    """
+    Cache of AI grading results for individual answers.
+
+    The first tier matches the normalized answer text exactly. The
+    second tier matches near-duplicate answers by the similarity of
+    their word sequences, so reordered words count as different, and
+    never when the answers differ by a negation or a number. Entries
+    are scoped to the question version, its text, its correct answers
+    and the explanation language; editing a question bumps its
+    version, which orphans all of its entries.
+    """
+    CACHE_ALIAS = "grading"
+    KEY_PREFIX = "grading"
+
+    def __init__(self) -> None:
+        options = getattr(settings, "GRADING_CACHE", {})
+        self.cache = caches[self.CACHE_ALIAS]
+        self.similarity_threshold = options.get("SIMILARITY_THRESHOLD", 0.9)
+        self.index_size = options.get("INDEX_SIZE", 200)
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        """
+        Hash a text for use in a cache key.
+
+        :param text: Text to hash.
+
+        :return: Hex digest.
+        """
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """
+        Normalize answer text so insignificant differences share a key.
+
+        :param text: Answer text.
+
+        :return: Normalized text.
+        """
+        return re.sub(r"\s+", " ", str(text)).strip().casefold()
+
+    @classmethod
+    def _words(cls, text: str) -> Tuple[str, ...]:
+        """
+        Split answer text into its words, keeping their order.
+
+        :param text: Answer text.
+
+        :return: Normalized words.
+        """
+        return tuple(re.findall(r"\w+", cls._normalize(text)))
+
+    def _version_key(self, question_id: int) -> str:
+        """
+        Build the key of a question version.
+
+        :param question_id: ID of the question.
+
+        :return: Cache key.
+        """
+        return f"{self.KEY_PREFIX}:version:{question_id}"
+
+    def _scope(self,
+               question: Question,
+               language: str,
+               versions: Dict[int, int]) -> str:
+        """
+        Build the key scope of a question.
+
+        :param question: Question instance.
+        :param language: Explanation language.
+        :param versions: Question versions mapped by ID.
+
+        :return: Key scope.
+        """
+        answer_key = "|".join(sorted(
+            answer.answer for answer in question.answers.all()
+            if answer.correct
+        ))
+        return (f"{question.id}:{versions.get(question.id, 0)}:"
+                f"{self._hash(question.question + answer_key)[:16]}:"
+                f"{self._normalize(language)}")
+
+    def _get_versions(self, question_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        Get the current versions of questions.
+
+        :param question_ids: IDs of the questions.
+
+        :return: Versions mapped by question ID.
+        """
+        keys = {self._version_key(q_id): q_id for q_id in set(question_ids)}
+        return {
+            keys[key]: version
+            for key, version in self.cache.get_many(keys.keys()).items()
+        }
+
+    def lookup(self,
+               questions: List[Question],
+               answers: List[str],
+               language: str) -> List[Optional[Dict]]:
+        """
+        Look up cached results for answers.
+
+        :param questions: Question of every answer.
+        :param answers: Answer texts.
+        :param language: Explanation language.
+
+        :return: Cached result or None for every answer.
+        """
+        versions = self._get_versions(q.id for q in questions)
+        scopes = [self._scope(q, language, versions) for q in questions]
+        exact_keys = [
+            f"{self.KEY_PREFIX}:exact:{scope}:"
+            f"{self._hash(self._normalize(answer))}"
+            for scope, answer in zip(scopes, answers)
+        ]
+        exact = self.cache.get_many(exact_keys)
+
+        results: List[Optional[Dict]] = []
+        indexes: Dict[str, List] = {}
+        for scope, answer, key in zip(scopes, answers, exact_keys):
+            if key in exact:
+                results.append(exact[key])
+                continue
+
+            if scope not in indexes:
+                indexes[scope] = self.cache.get(
+                    f"{self.KEY_PREFIX}:words:{scope}", []
+                )
+            results.append(
+                self._find_similar(indexes[scope], self._words(answer))
+            )
+
+        hits = sum(result is not None for result in results)
+        CacheMetrics.record(self.CACHE_ALIAS, True, hits)
+        CacheMetrics.record(self.CACHE_ALIAS, False, len(results) - hits)
+        if hits:
+            logger.info(f"Grading cache hits: {hits}/{len(results)}")
+        return results
+
+    @staticmethod
+    def _changes_meaning(matcher: SequenceMatcher) -> bool:
+        """
+        Check whether two word sequences differ by a negation or a number.
+
+        :param matcher: Matcher of the two word sequences.
+
+        :return: True if a differing word is a negation or a number.
+        """
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                continue
+            changed = matcher.a[i1:i2] + matcher.b[j1:j2]
+            if any(word in NEGATIONS or word.isdigit() for word in changed):
+                return True
+        return False
+
+    def _find_similar(self,
+                      index: List,
+                      words: Tuple[str, ...]) -> Optional[Dict]:
+        """
+        Find the result of the most similar cached answer.
+
+        :param index: Cached (words, result) pairs of a question.
+        :param words: Words of the answer.
+
+        :return: Result or None if nothing is similar enough.
+        """
+        if not words:
+            return None
+        best_result, best_similarity = None, 0.0
+        matcher = SequenceMatcher(autojunk=False)
+        matcher.set_seq2(words)
+        for cached_words, result in index:
+            matcher.set_seq1(cached_words)
+            if matcher.quick_ratio() < max(self.similarity_threshold,
+                                           best_similarity):
+                continue
+            similarity = matcher.ratio()
+            if (similarity > best_similarity
+                    and not self._changes_meaning(matcher)):
+                best_result, best_similarity = result, similarity
+        if best_similarity >= self.similarity_threshold:
+            return best_result
+        return None
+
+    def store(self,
+              questions: List[Question],
+              answers: List[str],
+              results: List[Dict],
+              language: str) -> None:
+        """
+        Store AI grading results.
+
+        :param questions: Question of every answer.
+        :param answers: Answer texts.
+        :param results: Result of every answer with the
+        ``correct`` and ``explanation`` fields.
+        :param language: Explanation language.
+        """
+        versions = self._get_versions(q.id for q in questions)
+        exact: Dict[str, Dict] = {}
+        additions: Dict[str, List] = {}
+
+        for question, answer, result in zip(questions, answers, results):
+            scope = self._scope(question, language, versions)
+            entry = {
+                "correct": bool(result.get("correct", False)),
+                "explanation": result.get("explanation") or "",
+            }
+            exact[f"{self.KEY_PREFIX}:exact:{scope}:"
+                  f"{self._hash(self._normalize(answer))}"] = entry
+            words = self._words(answer)
+            if words:
+                additions.setdefault(scope, []).append((words, entry))
+
+        self.cache.set_many(exact)
+        for scope, entries in additions.items():
+            key = f"{self.KEY_PREFIX}:words:{scope}"
+            index = self.cache.get(key, []) + entries
+            self.cache.set(key, index[-self.index_size:])
+
+    def invalidate(self, question_ids: Iterable[int]) -> None:
+        """
+        Drop the cached results of questions by bumping their versions.
+
+        :param question_ids: IDs of the edited questions.
+        """
+        question_ids = set(question_ids)
+        if not question_ids:
+            return
+        versions = self._get_versions(question_ids)
+        self.cache.set_many({
+            self._version_key(q_id): versions.get(q_id, 0) + 1
+            for q_id in question_ids
+        }, timeout=None)
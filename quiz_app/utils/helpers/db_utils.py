@@ -0,0 +1,43 @@
+import logging
+import time
+from typing import Callable, TypeVar
+
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def atomic_with_retry(operation: Callable[[], T]) -> T:
+    """
+    Run an operation in a transaction, retrying it with exponential
+    backoff while the database is locked by another writer.
+
+    SQLite transactions are started with BEGIN IMMEDIATE, so the lock
+    error is raised before anything is written. Inside an outer
+    transaction the operation is not retried, since only the outer
+    transaction can be replayed.
+
+    :param operation: Operation to run.
+
+    :return: Result of the operation.
+    """
+    options = getattr(settings, "DATABASE_LOCK_RETRY", {})
+    attempts = options.get("ATTEMPTS", 5)
+    delay = options.get("DELAY", 0.05)
+
+    for attempt in range(1, attempts + 1):
+        try:
+            with transaction.atomic():
+                return operation()
+        except OperationalError as e:
+            if ("locked" not in str(e) or attempt == attempts
+                    or connection.in_atomic_block):
+                raise
+            logger.warning(
+                f"Database locked, retrying ({attempt}/{attempts})"
+            )
+            time.sleep(delay * 2 ** (attempt - 1))
+    raise AssertionError("unreachable")
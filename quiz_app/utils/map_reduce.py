@@ -0,0 +1,157 @@
+import logging
+import math
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Set
+
+from django.conf import settings
+
+from exceptions.custom_exceptions import QuizGenerationError
+from quiz_app.utils.ai_generator import QuizGenerator
+from quiz_app.utils.text_selector import (SourceTextSelector,
+                                          estimate_tokens,
+                                          tokenize)
+
+logger = logging.getLogger(__name__)
+
+
+class MapReduceQuizGenerator:
+    """
+    Generates a quiz from a long document in two steps.
+
+    Map: the document is split into sections and candidate questions
+    are generated for every section concurrently.
+    Reduce: near-duplicate candidates are dropped and the final
+    questions are picked round-robin across sections, so the quiz
+    covers the whole document.
+    """
+    SIMILARITY_THRESHOLD = 0.8
+
+    def __init__(self,
+                 max_workers: Optional[int] = None,
+                 section_tokens: Optional[int] = None,
+                 max_sections: Optional[int] = None) -> None:
+        """
+        Initialize the generator.
+
+        :param max_workers: Maximum concurrent AI model calls.
+        :param section_tokens: Target size of a section in tokens.
+        :param max_sections: Maximum number of sections.
+        """
+        options = getattr(settings, "MAP_REDUCE", {})
+        self.max_workers = max_workers or options.get("MAX_WORKERS", 4)
+        self.section_tokens = (
+            section_tokens or options.get("SECTION_TOKENS", 4000)
+        )
+        self.max_sections = max_sections or options.get("MAX_SECTIONS", 10)
+
+    def split(self, text: str) -> List[str]:
+        """
+        Split the text into at most ``max_sections`` sections. Chunks
+        beyond the limit are merged into the last section, so the end
+        of the document is never dropped.
+
+        :param text: Source text.
+        :return: List of sections.
+        """
+        section_tokens = max(
+            self.section_tokens,
+            math.ceil(estimate_tokens(text) / self.max_sections)
+        )
+        sections = SourceTextSelector(chunk_tokens=section_tokens).chunk(text)
+        if len(sections) > self.max_sections:
+            last = self.max_sections - 1
+            sections[last:] = [" ".join(sections[last:])]
+        return sections
+
+    def generate(self,
+                 creator_input: str,
+                 language: str,
+                 text: str,
+                 number_of_questions: int) -> Dict:
+        """
+        Generate a quiz from the text.
+
+        :param creator_input: User input for quiz generation.
+        :param language: Language for quiz generation.
+        :param text: Source text.
+        :param number_of_questions: Number of questions in the quiz.
+
+        :return: Quiz data.
+
+        :raises QuizGenerationError: If no section could be generated.
+        """
+        sections = self.split(text)
+        per_section = math.ceil(number_of_questions / len(sections)) + 1
+        section_input = (f"{creator_input} Only generate {per_section} "
+                         f"questions about this part of the document.")
+
+        results: Dict[int, Dict] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(
+                    QuizGenerator().generate_quiz,
+                    section_input,
+                    language,
+                    section
+                ): index
+                for index, section in enumerate(sections)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except QuizGenerationError as e:
+                    logger.warning(f"Section {index} failed: {str(e)}")
+
+        if not results:
+            raise QuizGenerationError("Failed to generate any section")
+
+        ordered = [results[index] for index in sorted(results)]
+        return {
+            "name": ordered[0].get("name"),
+            "questions": self._reduce(ordered, number_of_questions),
+        }
+
+    def _reduce(self,
+                section_quizzes: List[Dict],
+                number_of_questions: int) -> List[Dict]:
+        """
+        Pick the final questions from the section candidates.
+
+        :param section_quizzes: Generated quiz of every section.
+        :param number_of_questions: Number of questions to pick.
+
+        :return: Selected questions.
+        """
+        candidates = [
+            list(quiz.get("questions", [])) for quiz in section_quizzes
+        ]
+        selected: List[Dict] = []
+        selected_terms: List[Set[str]] = []
+
+        while len(selected) < number_of_questions and any(candidates):
+            for section in candidates:
+                if not section or len(selected) >= number_of_questions:
+                    continue
+                question = section.pop(0)
+                terms = set(tokenize(question.get("question", "")))
+                if any(self._similarity(terms, other)
+                       >= self.SIMILARITY_THRESHOLD
+                       for other in selected_terms):
+                    continue
+                selected.append(question)
+                selected_terms.append(terms)
+        return selected
+
+    @staticmethod
+    def _similarity(first: Set[str], second: Set[str]) -> float:
+        """
+        Jaccard similarity of two token sets.
+
+        :param first: First token set.
+        :param second: Second token set.
+        :return: Similarity between 0 and 1.
+        """
+        if not first or not second:
+            return 0.0
+        return len(first & second) / len(first | second)
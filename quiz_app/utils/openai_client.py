@@ -0,0 +1,167 @@
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+import httpx
+from decouple import config  # type: ignore
+from django.conf import settings
+from openai import OpenAI
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionMetrics:
+    """
+    Counts requests and newly opened connections of the shared client,
+    so connection reuse can be monitored.
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+
+    def trace(self, event_name: str, info: dict) -> None:
+        """
+        httpcore trace callback.
+
+        :param event_name: Name of the traced event.
+        :param info: Event information.
+        """
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self.connections_opened += 1
+        elif event_name == "connection.start_tls.complete":
+            with self._lock:
+                self.tls_handshakes += 1
+
+    def on_request(self, request: httpx.Request) -> None:
+        """
+        httpx request hook, counts the request and attaches the tracer.
+
+        :param request: Outgoing request.
+        """
+        with self._lock:
+            self.requests += 1
+        request.extensions["trace"] = self.trace
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Get the current counters.
+
+        :return: Counters and the share of requests that reused
+        an open connection.
+        """
+        with self._lock:
+            reused = max(self.requests - self.connections_opened, 0)
+            return {
+                "requests": self.requests,
+                "connections_opened": self.connections_opened,
+                "tls_handshakes": self.tls_handshakes,
+                "reuse_ratio": (
+                    reused / self.requests if self.requests else 0.0
+                ),
+            }
+
+
+class OpenAIClientRegistry:
+    """
+    Process-wide registry of a single pooled OpenAI client.
+
+    The client is created lazily on first use and recreated after a
+    fork, so web and Celery worker processes each keep one connection
+    pool that is reused by every QuizGenerator.
+    """
+    _lock = threading.Lock()
+    _client: Optional[OpenAI] = None
+    _pid: Optional[int] = None
+    metrics = ConnectionMetrics()
+    # Log the metrics at INFO once every this many requests
+    METRICS_LOG_INTERVAL = 100
+
+    @staticmethod
+    def _get_options() -> dict:
+        """
+        Get the client options from the settings.
+
+        :return: Client options.
+        """
+        defaults = {
+            "MAX_CONNECTIONS": 20,
+            "MAX_KEEPALIVE_CONNECTIONS": 10,
+            "KEEPALIVE_EXPIRY": 60.0,
+            "CONNECT_TIMEOUT": 5.0,
+            "TIMEOUT": 60.0,
+            "MAX_RETRIES": 2,
+        }
+        return {**defaults, **getattr(settings, "OPENAI_CLIENT", {})}
+
+    @classmethod
+    def _create_client(cls) -> OpenAI:
+        """
+        Create the pooled client.
+
+        :return: OpenAI client.
+        """
+        options = cls._get_options()
+        http_client = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=options["MAX_CONNECTIONS"],
+                max_keepalive_connections=options[
+                    "MAX_KEEPALIVE_CONNECTIONS"
+                ],
+                keepalive_expiry=options["KEEPALIVE_EXPIRY"],
+            ),
+            timeout=httpx.Timeout(
+                options["TIMEOUT"],
+                connect=options["CONNECT_TIMEOUT"],
+            ),
+            event_hooks={"request": [cls.metrics.on_request]},
+        )
+        return OpenAI(
+            api_key=config("OPEN_AI_SECRET_KEY"),
+            http_client=http_client,
+            max_retries=options["MAX_RETRIES"],
+        )
+
+    @classmethod
+    def get_client(cls) -> OpenAI:
+        """
+        Get the shared client of this process.
+
+        :return: OpenAI client.
+        """
+        pid = os.getpid()
+        if cls._client is None or cls._pid != pid:
+            with cls._lock:
+                if cls._client is None or cls._pid != pid:
+                    logger.info(f"Creating OpenAI client for process {pid}")
+                    cls.metrics = ConnectionMetrics()
+                    cls._client = cls._create_client()
+                    cls._pid = pid
+        return cls._client
+
+    @classmethod
+    def get_metrics(cls) -> Dict:
+        """
+        Get the pool limits and connection reuse metrics of this process.
+
+        :return: Metrics snapshot.
+        """
+        options = cls._get_options()
+        return {
+            "pid": os.getpid(),
+            "max_connections": options["MAX_CONNECTIONS"],
+            "max_keepalive_connections": options["MAX_KEEPALIVE_CONNECTIONS"],
+            **cls.metrics.snapshot(),
+        }
+
+    @classmethod
+    def log_metrics(cls) -> None:
+        """
+        Log the metrics at INFO on every METRICS_LOG_INTERVAL-th request.
+        """
+        requests = cls.metrics.requests
+        if requests and requests % cls.METRICS_LOG_INTERVAL == 0:
+            logger.info(f"OpenAI connection metrics: {cls.get_metrics()}")
@@ -1,6 +1,203 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+import uuid
+from collections import OrderedDict
+from typing import List, Optional
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 class CustomPaginator(PageNumberPagination):
     page_size = 6
     max_page_size = 10
+
+
+class KeysetPaginator(BasePagination):
+    """
+    Cursor pagination ordered by ``(created_at, id)``.
+
+    Each page continues after the last row of the previous one instead
+    of counting and skipping rows, so deep pages cost the same as the
+    first page. Pass the returned ``next`` link to get the following
+    page; there is no total count.
+    """
+    page_size = CustomPaginator.page_size
+    cursor_query_param = "cursor"
+    ordering = ("created_at", "id")
+
+    def paginate_queryset(self, queryset, request, view=None) -> List:
+        """
+        Get the page of the queryset after the requested cursor.
+
+        :param queryset: Queryset to paginate.
+        :param request: Request object.
+        :param view: View instance.
+
+        :return: Objects on the page.
+        """
+        self.request = request
+        position = self._decode_position(
+            request.query_params.get(self.cursor_query_param)
+        )
+        queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            created_at, pk = position
+            queryset = queryset.filter(
+                Q(created_at__gt=created_at)
+                | Q(created_at=created_at, id__gt=pk)
+            )
+
+        page = list(queryset[:self.page_size + 1])
+        self.next_position = None
+        if len(page) > self.page_size:
+            page = page[:self.page_size]
+            self.next_position = [
+                page[-1].created_at.isoformat(), str(page[-1].pk)
+            ]
+        return page
+
+    @staticmethod
+    def _decode_position(cursor: Optional[str]):
+        """
+        Decode a cursor into a (created_at, id) position.
+
+        :param cursor: Cursor string or None.
+        :return: Position or None for the first page.
+
+        :raises ValidationError: If the cursor is malformed.
+        """
+        position = decode_cursor(cursor)
+        if position is None:
+            return None
+        try:
+            created_at, pk = position
+            created_at = parse_datetime(created_at)
+            pk = uuid.UUID(pk)
+        except (TypeError, ValueError, AttributeError):
+            raise ValidationError("Invalid cursor")
+        if created_at is None:
+            raise ValidationError("Invalid cursor")
+        return created_at, pk
+
+    def get_next_link(self) -> Optional[str]:
+        """
+        Get the link to the next page.
+
+        :return: URL or None on the last page.
+        """
+        if self.next_position is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            encode_cursor(self.next_position)
+        )
+
+    def get_paginated_response(self, data) -> Response:
+        return Response(OrderedDict([
+            ("next", self.get_next_link()),
+            ("results", data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {
+                    "type": "string",
+                    "nullable": True,
+                    "format": "uri",
+                },
+                "results": schema,
+            },
+        }
+
+
+class SelectablePaginator(BasePagination):
+    """
+    Page number pagination by default, keyset pagination when the
+    request passes ``?pagination=cursor`` or a ``cursor``.
+
+    Views choose their default with a ``pagination_mode`` attribute.
+    """
+    mode_query_param = "pagination"
+    paginators = {
+        "page": CustomPaginator,
+        "cursor": KeysetPaginator,
+    }
+    default_mode = "page"
+
+    def __init__(self):
+        self.paginator = None
+
+    def _get_paginator(self, request, view=None) -> BasePagination:
+        """
+        Create the paginator selected by the request or the view.
+
+        :param request: Request object.
+        :param view: View instance.
+
+        :return: Paginator instance.
+
+        :raises ValidationError: If the requested mode is unknown.
+        """
+        mode = request.query_params.get(self.mode_query_param)
+        if mode is None:
+            if KeysetPaginator.cursor_query_param in request.query_params:
+                mode = "cursor"
+            else:
+                mode = getattr(view, "pagination_mode", self.default_mode)
+        if mode not in self.paginators:
+            raise ValidationError(
+                f"Unknown pagination, use one of: "
+                f"{', '.join(self.paginators)}"
+            )
+        return self.paginators[mode]()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self._get_paginator(request, view)
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data) -> Response:
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return CustomPaginator().get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        return CustomPaginator().get_schema_operation_parameters(view)
+
+
+def encode_cursor(position) -> str:
+    """
+    Encode a keyset position into an opaque cursor string.
+
+    :param position: JSON serializable position.
+    :return: Cursor string.
+    """
+    return base64.urlsafe_b64encode(
+        json.dumps(position).encode("utf-8")
+    ).decode("ascii")
+
+
+def decode_cursor(cursor: Optional[str]):
+    """
+    Decode a cursor string created by encode_cursor.
+
+    :param cursor: Cursor string or None.
+    :return: Position or None.
+
+    :raises ValidationError: If the cursor is malformed.
+    """
+    if not cursor:
+        return None
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise ValidationError("Invalid cursor")
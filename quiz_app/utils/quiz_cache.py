@@ -0,0 +1,119 @@
+import hashlib
+import logging
+import time
+import uuid
+from typing import Dict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import Http404
+
+from quiz_app.utils.cache_policy import CacheMetrics, CacheVersion
+from quiz_app.utils.student_payload import StudentPayloadService
+
+logger = logging.getLogger(__name__)
+
+
+class QuizPayloadCache:
+    """
+    Read-through cache of the student view of quizzes.
+
+    Entries are keyed on the quiz ID and its ``quiz-content:<id>``
+    version, which only QuizCreator, QuizUpdater and deletes bump, so
+    submissions, which bump ``quiz:<id>``, keep it cached. Concurrent misses
+    of the same quiz wait for a single loader, so a shared link opened
+    by a whole class costs one database read.
+    """
+    CACHE_ALIAS = "views"
+    KEY_PREFIX = "quiz-payload"
+    LOCK_TIMEOUT = 10
+    WAIT_INTERVAL = 0.05
+    WAIT_ATTEMPTS = 40
+
+    def __init__(self) -> None:
+        self.cache = caches[self.CACHE_ALIAS]
+        self.timeout = getattr(settings, "QUIZ_PAYLOAD_CACHE_TIMEOUT",
+                               60 * 60)
+
+    @staticmethod
+    def make_etag(content: bytes) -> str:
+        """
+        Build the entity tag of a payload.
+
+        :param content: JSON bytes of the quiz.
+
+        :return: Quoted entity tag.
+        """
+        return f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+
+    def get(self, quiz_id) -> Dict:
+        """
+        Get the student view of a quiz, loading it on a miss.
+
+        :param quiz_id: ID of the quiz from the URL.
+
+        :return: Cache entry with the ``content`` JSON bytes, its
+        ``etag`` and the ``creator_id`` of the quiz.
+
+        :raises Http404: If the quiz does not exist.
+        """
+        try:
+            quiz_id = str(uuid.UUID(str(quiz_id)))
+        except ValueError:
+            raise Http404("Quiz not found")
+        scope = f"quiz-content:{quiz_id}"
+        version = CacheVersion.get_many([scope])[scope]
+        key = f"{self.KEY_PREFIX}:{quiz_id}:{version}"
+
+        entry = self.cache.get(key)
+        CacheMetrics.record(self.KEY_PREFIX, entry is not None)
+        if entry is None:
+            entry = self._fill(key, quiz_id)
+        return entry
+
+    def _load(self, quiz_id: str) -> Dict:
+        """
+        Load the stored student view of a quiz.
+
+        :param quiz_id: ID of the quiz.
+
+        :return: Cache entry.
+
+        :raises Http404: If the quiz does not exist.
+        """
+        row = StudentPayloadService.load(quiz_id)
+        if row is None:
+            raise Http404("Quiz not found")
+        content, creator_id = row
+        return {
+            "content": content,
+            "etag": self.make_etag(content),
+            "creator_id": creator_id,
+        }
+
+    def _fill(self, key: str, quiz_id: str) -> Dict:
+        """
+        Load a missing entry, letting only one process hit the database.
+
+        :param key: Cache key.
+        :param quiz_id: ID of the quiz.
+
+        :return: Cache entry.
+        """
+        lock_key = f"{key}:lock"
+        for _ in range(self.WAIT_ATTEMPTS):
+            if self.cache.add(lock_key, True, self.LOCK_TIMEOUT):
+                try:
+                    entry = self._load(quiz_id)
+                    self.cache.set(key, entry, self.timeout)
+                    return entry
+                finally:
+                    self.cache.delete(lock_key)
+
+            time.sleep(self.WAIT_INTERVAL)
+            entry = self.cache.get(key)
+            if entry is not None:
+                return entry
+
+        logger.warning(f"Timed out waiting for the quiz payload {key}")
+        return self._load(quiz_id)
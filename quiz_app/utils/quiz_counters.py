@@ -0,0 +1,97 @@
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from django.db.models import (Count, DecimalField, OuterRef, Subquery, Sum,
+                              Value)
+from django.db.models.functions import Coalesce
+
+from quiz_app.models import Question, Quiz
+
+
+class QuizCounterService:
+    """
+    Checks and repairs the denormalized ``Quiz.question_count`` and
+    ``Quiz.total_score`` columns.
+
+    QuizCreator and QuizUpdater keep them in sync; this service covers
+    questions changed by other means, e.g. the admin site.
+    """
+
+    @staticmethod
+    def _filter(queryset, quiz_ids: Optional[List]):
+        """
+        Limit a quiz queryset to the given IDs.
+
+        :param queryset: Quiz queryset.
+        :param quiz_ids: IDs of the quizzes, all quizzes if None.
+
+        :return: Filtered queryset.
+        """
+        if quiz_ids is None:
+            return queryset
+        return queryset.filter(id__in=quiz_ids)
+
+    @staticmethod
+    def _counter_expressions() -> Dict:
+        """
+        Build the expressions computing the counters from the questions.
+
+        :return: Expressions mapped by field name.
+        """
+        questions = Question.objects.filter(
+            quiz=OuterRef("pk")
+        ).values("quiz")
+        return {
+            "question_count": Coalesce(
+                Subquery(questions.annotate(
+                    count=Count("id")
+                ).values("count")),
+                Value(0)
+            ),
+            "total_score": Coalesce(
+                Subquery(questions.annotate(
+                    total=Sum("score")
+                ).values("total")),
+                Value(Decimal(0)),
+                output_field=DecimalField(max_digits=9, decimal_places=2)
+            ),
+        }
+
+    @classmethod
+    def rebuild(cls, quiz_ids: Optional[List] = None) -> int:
+        """
+        Recompute the counters with a single UPDATE.
+
+        :param quiz_ids: Quizzes to rebuild, all quizzes if None.
+
+        :return: Number of updated quizzes.
+        """
+        return cls._filter(Quiz.objects.all(), quiz_ids).update(
+            **cls._counter_expressions()
+        )
+
+    @classmethod
+    def verify(cls, quiz_ids: Optional[List] = None) -> List[str]:
+        """
+        Compare the stored counters with the questions.
+
+        :param quiz_ids: Quizzes to verify, all quizzes if None.
+
+        :return: Descriptions of the mismatches.
+        """
+        expressions = cls._counter_expressions()
+        rows = cls._filter(Quiz.objects.all(), quiz_ids).annotate(
+            expected_count=expressions["question_count"],
+            expected_score=expressions["total_score"],
+        ).values(
+            "id", "question_count", "total_score",
+            "expected_count", "expected_score"
+        )
+        return [
+            f"Quiz {row['id']}: stored {row['question_count']} questions "
+            f"worth {row['total_score']}, expected {row['expected_count']} "
+            f"worth {row['expected_score']}"
+            for row in rows
+            if row["question_count"] != row["expected_count"]
+            or row["total_score"] != row["expected_score"]
+        ]
@@ -1,6 +1,12 @@
+from decimal import Decimal
 from typing import Optional, List, Dict, Set
 from django.db import transaction
+from django.db.models import prefetch_related_objects
+from django.utils import timezone
 from quiz_app.models import Question, Answer, Quiz
+from quiz_app.utils.cache_policy import CacheVersion
+from quiz_app.utils.grading_cache import GradingCache
+from quiz_app.utils.student_payload import StudentPayloadService
 
 
 class QuizCreator:
@@ -27,31 +33,61 @@ class QuizCreator:
 
         :return: The created Quiz instance.
         """
-        quiz = Quiz.objects.create(**self.validated_data, creator=self.user)
+        quiz = Quiz.objects.create(
+            **self.validated_data,
+            creator=self.user,
+            question_count=len(self.questions_data),
+            total_score=sum(
+                (Decimal(str(question.get("score", 1)))
+                 for question in self.questions_data),
+                Decimal(0)
+            )
+        )
         self._create_questions(quiz)
+        StudentPayloadService.refresh(quiz)
+        CacheVersion.bump(f"quiz:{quiz.pk}", f"quiz-content:{quiz.pk}",
+                          f"creator:{self.user.pk}")
         return quiz
 
     def _create_questions(self, quiz: Quiz) -> None:
         """
-        Creates questions and their corresponding answers for a quiz.
+        Creates questions and their corresponding answers for a quiz
+        with one INSERT per table.
 
         :param quiz: The created quiz instance.
         """
-        for question in self.questions_data:
-            answers_data = question.pop("answers", [])
-            question_obj = Question.objects.create(**question, quiz=quiz)
-
-            Answer.objects.bulk_create([
-                Answer(
-                    **answer,
-                    question=question_obj
-                ) for answer in answers_data
-            ])
+        answers_data: List[List[Dict]] = [
+            question.pop("answers", []) for question in self.questions_data
+        ]
+        questions = Question.objects.bulk_create([
+            Question(
+                quiz=quiz,
+                **{k: v for k, v in question.items() if k != "id"}
+            ) for question in self.questions_data
+        ])
+
+        if questions and questions[0].pk is None:
+            # The backend does not return primary keys from bulk inserts,
+            # the questions of a new quiz are read back in insert order.
+            questions = list(Question.objects.filter(quiz=quiz).order_by("id"))
+
+        Answer.objects.bulk_create([
+            Answer(
+                question=question,
+                **{k: v for k, v in answer.items() if k != "id"}
+            )
+            for question, answers in zip(questions, answers_data)
+            for answer in answers
+        ])
 
 
 class QuizUpdater:
     """
     This class is responsible for updating the quiz instance.
+
+    The incoming data is diffed against the stored question/answer
+    tree and only changed rows are written, with one bulk statement
+    per table and operation.
     """
     def __init__(self, instance: Quiz, validated_data: dict) -> None:
         """
@@ -66,13 +102,21 @@ class QuizUpdater:
             self.validated_data.pop("questions", None)
         )
 
-        # Prepare existing questions for comparison
+        # Load the question/answer tree (no-op if already prefetched)
+        prefetch_related_objects([self.instance], "questions__answers")
         self.existing_questions: Dict[int, Question] = {
             q.id: q for q in self.instance.questions.all()
         }
-        self.existing_question_ids: Set[int] = set(
-            self.existing_questions.keys()
-        )
+
+        self.questions_to_update: List[Question] = []
+        self.question_fields: Set[str] = set()
+        self.questions_to_create: List[Question] = []
+        self.questions_to_delete: Set[int] = set()
+        self.new_question_answers: List[List[dict]] = []
+        self.answers_to_update: List[Answer] = []
+        self.answer_fields: Set[str] = set()
+        self.answers_to_create: List[Answer] = []
+        self.answers_to_delete: Set[int] = set()
 
     @transaction.atomic
     def update(self) -> Quiz:
@@ -81,129 +125,208 @@ class QuizUpdater:
 
         :return: Updated quiz instance
         """
-        self._update_quiz_fields()
+        quiz_fields = self._apply_changes(self.instance, self.validated_data)
         if self.questions_data is not None:
-            self._handle_questions()
+            self._diff_questions()
+            self._save_questions()
+            self._save_answers()
+            quiz_fields += self._update_counters()
+        if quiz_fields or self._has_question_changes():
+            self.instance.save()
+            StudentPayloadService.refresh(self.instance)
+            CacheVersion.bump(
+                f"quiz:{self.instance.pk}",
+                f"quiz-content:{self.instance.pk}",
+                f"creator:{self.instance.creator_id}"
+            )
+        self._invalidate_grading_cache()
         return self.instance
 
-    def _update_quiz_fields(self) -> None:
+    def _update_counters(self) -> List[str]:
+        """
+        Set the question count and total score of the quiz from the
+        questions it has after the update.
+
+        :return: Names of the changed counter fields.
+        """
+        questions = [
+            question for q_id, question in self.existing_questions.items()
+            if q_id not in self.questions_to_delete
+        ] + self.questions_to_create
+        return self._apply_changes(self.instance, {
+            "question_count": len(questions),
+            "total_score": sum(
+                (Decimal(str(question.score)) for question in questions),
+                Decimal(0)
+            ),
+        })
+
+    def _invalidate_grading_cache(self) -> None:
+        """
+        Drop cached grading results of the edited questions
+        once the transaction is committed.
         """
-        Update the quiz instance fields.
+        edited_question_ids: Set[int] = {
+            *self.questions_to_delete,
+            *(q.id for q in self.questions_to_update),
+            *(a.question_id for a in self.answers_to_update),
+            *(a.question_id for a in self.answers_to_create),
+        }
+        edited_question_ids.update(
+            question.id for question in self.existing_questions.values()
+            if any(a.id in self.answers_to_delete
+                   for a in question.answers.all())
+        )
+        if edited_question_ids:
+            transaction.on_commit(
+                lambda: GradingCache().invalidate(edited_question_ids)
+            )
+
+    @staticmethod
+    def _apply_changes(obj, data: dict) -> List[str]:
         """
-        for attr, value in self.validated_data.items():
-            setattr(self.instance, attr, value)
-        self.instance.save()
+        Set the changed fields on a model instance.
+
+        :param obj: Model instance.
+        :param data: Incoming field values.
 
-    def _handle_questions(self) -> None:
+        :return: Names of the changed fields.
         """
-        Processes the creation, updating, and deletion of questions.
+        changed = []
+        for key, value in data.items():
+            if key == "id" or getattr(obj, key) == value:
+                continue
+            setattr(obj, key, value)
+            changed.append(key)
+        return changed
+
+    def _has_question_changes(self) -> bool:
+        """
+        Check if any question or answer row is written.
+        """
+        return bool(
+            self.questions_to_update or self.questions_to_create
+            or self.questions_to_delete or self.answers_to_update
+            or self.answers_to_create or self.answers_to_delete
+        )
+
+    def _diff_questions(self) -> None:
+        """
+        Compare the incoming questions with the stored ones.
         """
         incoming_question_ids: Set[int] = set()
 
-        if self.questions_data:
-            for q_data in self.questions_data:
-                self._handle_question(q_data, incoming_question_ids)
+        for q_data in self.questions_data or []:
+            q_id: Optional[int] = q_data.get("id")
+            answers_data: List[dict] = q_data.pop("answers", [])
+
+            if q_id and q_id in self.existing_questions:
+                incoming_question_ids.add(q_id)
+                question = self.existing_questions[q_id]
+                changed = self._apply_changes(question, q_data)
+                if changed:
+                    self.questions_to_update.append(question)
+                    self.question_fields.update(changed)
+                if answers_data:
+                    self._diff_answers(question, answers_data)
+            else:
+                self.questions_to_create.append(Question(
+                    quiz=self.instance,
+                    **{k: v for k, v in q_data.items() if k != "id"}
+                ))
+                self.new_question_answers.append(answers_data)
 
         # Delete questions not in the update data
-        questions_to_delete: Set[int] = (
-                self.existing_question_ids - incoming_question_ids
+        self.questions_to_delete = (
+            set(self.existing_questions.keys()) - incoming_question_ids
         )
-        if questions_to_delete:
-            Question.objects.filter(id__in=questions_to_delete).delete()
-
-    def _handle_question(self,
-                         q_data: dict,
-                         incoming_question_ids: Set[int]) -> None:
-        """
-        Handles updating or creating a single question.
-
-        :param q_data: The question data from the request.
-        :param incoming_question_ids: A set to track question IDs.
-        """
-        q_id: Optional[int] = q_data.get('id')
-        answers_data: List[dict] = q_data.pop('answers', [])
-
-        if q_id and q_id in self.existing_question_ids:
-            # Update existing question
-
-            incoming_question_ids.add(q_id)
-            question = self.existing_questions[q_id]
-            # Update fields individually
-            for key, value in q_data.items():
-                if key != 'id':
-                    setattr(question, key, value)
-            question.save()
-        else:
-            # Create new question
-            question = Question.objects.create(
-                quiz=self.instance,
-                **{k: v for k, v in q_data.items() if k != 'id'}
-            )
-            incoming_question_ids.add(question.id)
-
-        # Handle answers for this question
-        if answers_data:
-            self._handle_answers(question, answers_data)
 
-    def _handle_answers(self,
-                        question: Question,
-                        answers_data: List[dict]) -> None:
+    def _diff_answers(self,
+                      question: Question,
+                      answers_data: List[dict]) -> None:
         """
-        Handles the creation, updating, and deletion of answers
-        for a given question.
+        Compare the incoming answers of a question with the stored ones.
 
         :param question: The question instance related to these answers.
         :param answers_data: List of answer data dictionaries.
         """
-        self.existing_answers: Dict[int, Answer] = {
+        existing_answers: Dict[int, Answer] = {
             a.id: a for a in question.answers.all()
         }
-        self.existing_answer_ids: Set[int] = set(self.existing_answers.keys())
-        self.incoming_answer_ids: Set[int] = set()
+        incoming_answer_ids: Set[int] = set()
 
-        answers_to_create: List[Answer] = []
         for a_data in answers_data:
-            self._handle_answer(a_data, question, answers_to_create)
-
-        # Bulk create new answers
-        if answers_to_create:
-            Answer.objects.bulk_create(answers_to_create)
+            a_id: Optional[int] = a_data.get("id")
+            if a_id and a_id in existing_answers:
+                incoming_answer_ids.add(a_id)
+                answer = existing_answers[a_id]
+                changed = self._apply_changes(answer, a_data)
+                if changed:
+                    self.answers_to_update.append(answer)
+                    self.answer_fields.update(changed)
+            else:
+                self.answers_to_create.append(Answer(
+                    question=question,
+                    **{k: v for k, v in a_data.items() if k != "id"}
+                ))
 
         # Delete answers not in the update data
-        answers_to_delete: Set[int] = (
-                self.existing_answer_ids - self.incoming_answer_ids
+        self.answers_to_delete.update(
+            set(existing_answers.keys()) - incoming_answer_ids
         )
-        if answers_to_delete:
-            Answer.objects.filter(id__in=answers_to_delete).delete()
-
-    def _handle_answer(self,
-                       a_data: dict,
-                       question: Question,
-                       answers_to_create: List[Answer]) -> None:
-        """
-        Handles updating or creating a single answer.
-
-        :param a_data: The answer data from the request.
-        :param question: The question instance related to this answer.
-        :param answers_to_create: A list of new answers for bulk creation.
-        """
-        a_id: Optional[int] = a_data.get('id')
-
-        if a_id and a_id in self.existing_answer_ids:
-            # Update existing answer
-            self.incoming_answer_ids.add(a_id)
-            answer = self.existing_answers[a_id]
-
-            # Update fields individually
-            for key, value in a_data.items():
-                if key != 'id':
-                    setattr(answer, key, value)
-            answer.save()
-        else:
-            # Prepare new answer for bulk creation
-            answers_to_create.append(
+
+    def _save_questions(self) -> None:
+        """
+        Write the question changes.
+        """
+        if self.questions_to_delete:
+            Question.objects.filter(id__in=self.questions_to_delete).delete()
+
+        if self.questions_to_update:
+            now = timezone.now()
+            for question in self.questions_to_update:
+                question.updated_at = now
+            Question.objects.bulk_update(
+                self.questions_to_update,
+                [*self.question_fields, "updated_at"]
+            )
+
+        if self.questions_to_create:
+            created = Question.objects.bulk_create(self.questions_to_create)
+            if created[0].pk is None:
+                # The backend does not return primary keys from bulk
+                # inserts, the new questions are read back in insert order.
+                created = list(
+                    Question.objects.filter(quiz=self.instance).exclude(
+                        id__in=self.existing_questions.keys()
+                    ).order_by("id")
+                )
+            self.answers_to_create.extend(
                 Answer(
                     question=question,
-                    **{k: v for k, v in a_data.items() if k != 'id'}
+                    **{k: v for k, v in answer.items() if k != "id"}
                 )
+                for question, answers in zip(
+                    created, self.new_question_answers
+                )
+                for answer in answers
             )
+
+    def _save_answers(self) -> None:
+        """
+        Write the answer changes.
+        """
+        if self.answers_to_delete:
+            Answer.objects.filter(id__in=self.answers_to_delete).delete()
+
+        if self.answers_to_update:
+            now = timezone.now()
+            for answer in self.answers_to_update:
+                answer.updated_at = now
+            Answer.objects.bulk_update(
+                self.answers_to_update,
+                [*self.answer_fields, "updated_at"]
+            )
+
+        if self.answers_to_create:
+            Answer.objects.bulk_create(self.answers_to_create)
@@ -1,21 +1,34 @@
 import copy
+import json
 import logging
-from typing import Optional, List, Dict
+import uuid
+from typing import Optional, List, Dict, Iterator, Tuple
 from uuid import UUID
 
+from django.conf import settings
 from django.core.files.uploadedfile import InMemoryUploadedFile
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import transaction, IntegrityError
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
 from rest_framework.request import Request
 from rest_framework.viewsets import ModelViewSet
 
 from exceptions.custom_exceptions import QuizGenerationError
-from quiz_app.models import Question, Quiz, UserAnswer
+from quiz_app.models import (Question, Quiz, UserAnswer, QuizScore,
+                             QuizGenerationJob)
 from quiz_app.serializers import QuizSerializer
 from quiz_app.utils import QuizGenerator, FileProcessor
-
-from quiz_app.tasks import send_email
+from quiz_app.utils.generation_cache import GenerationCache
+from quiz_app.utils.grading import SubmissionGrader, BatchGrader
+from quiz_app.utils.helpers.db_utils import atomic_with_retry
+from quiz_app.utils.map_reduce import MapReduceQuizGenerator
+from quiz_app.utils.quiz_modifier import QuizCreator
+from quiz_app.utils.stats import QuizStatsService
+from quiz_app.utils.text_selector import SourceTextSelector
+
+from quiz_app.tasks import send_email, generate_quiz_job
 from user.serializers import QuizScoreSerializer
 
 
@@ -26,39 +39,106 @@ class QuizGenerationService:
     """
     Service for generating quizzes.
     """
+    @staticmethod
+    def build_creator_input(serializer_data: dict) -> str:
+        """
+        Build the prompt for quiz generation from the input data.
+
+        :param serializer_data: Validated InputSerializer data.
+
+        :return: User input for quiz generation.
+        """
+        topic = serializer_data.get("topic_in_preferred_language")
+        number_of_questions = serializer_data.get("number_of_questions")
+        type_of_questions = serializer_data.get("type_of_questions")
+        language = serializer_data.get("language")
+
+        return (f"Generate a quiz in {language} language "
+                f"with {number_of_questions} "
+                f"{type_of_questions} questions about {topic}.")
+
     def generate_quiz_from_file(self,
                                 file: InMemoryUploadedFile,
                                 language: str,
-                                creator_input: str) -> dict:
+                                creator_input: str,
+                                use_cache: bool = True,
+                                number_of_questions: Optional[int] = None,
+                                map_reduce: bool = False
+                                ) -> dict:
         """
         Generate a quiz using file content and creator input
 
         :param file: File object.
         :param language: Language for quiz generation.
         :param creator_input: User input for quiz generation.
+        :param use_cache: Whether to reuse a previously generated quiz.
+        :param number_of_questions: Number of questions in the quiz,
+        required for map-reduce generation.
+        :param map_reduce: Whether to generate the quiz section by section.
 
         :return: Quiz data.
         """
         text = FileProcessor(file).process_file()
-        return self.generate_quiz_data(creator_input, language, text)
+        return self.generate_quiz_data(
+            creator_input, language, text, use_cache,
+            number_of_questions, map_reduce
+        )
 
     @staticmethod
     def generate_quiz_data(creator_input: str,
                            language: str,
-                           text: Optional[str] = None) -> dict:
+                           text: Optional[str] = None,
+                           use_cache: bool = True,
+                           number_of_questions: Optional[int] = None,
+                           map_reduce: bool = False
+                           ) -> dict:
         """
         Generate quiz data based on file and/or creator input.
 
         :param creator_input: User input for quiz generation.
         :param language: Language for quiz generation.
         :param text: Text content for quiz generation.
+        :param use_cache: Whether to reuse a previously generated quiz.
+        :param number_of_questions: Number of questions in the quiz,
+        required for map-reduce generation.
+        :param map_reduce: Whether to generate the quiz section by section.
 
         :return: Quiz data.
+
+        :raises QuizGenerationError: If map-reduce generation is requested
+        without text or number of questions.
         """
+        if map_reduce and not (text and number_of_questions):
+            raise QuizGenerationError(
+                "Map-reduce generation requires source text "
+                "and a number of questions"
+            )
+        if text and not map_reduce:
+            text = SourceTextSelector().select(text, creator_input)
+
+        generation_cache = GenerationCache()
+        cache_key = generation_cache.make_key(
+            creator_input, language, text, map_reduce
+        )
+        if use_cache:
+            quiz_data = generation_cache.get(cache_key)
+            if quiz_data is not None:
+                return quiz_data
+
         quiz_generator = QuizGenerator()
-        if text:
-            return quiz_generator.generate_quiz(creator_input, language, text)
-        return quiz_generator.generate_quiz(creator_input, language)
+        if map_reduce:
+            quiz_data = MapReduceQuizGenerator().generate(
+                creator_input, language, text, number_of_questions
+            )
+        elif text:
+            quiz_data = quiz_generator.generate_quiz(
+                creator_input, language, text
+            )
+        else:
+            quiz_data = quiz_generator.generate_quiz(creator_input, language)
+
+        generation_cache.set(cache_key, quiz_data)
+        return quiz_data
 
 
 class QuizDataProcessor:
@@ -90,24 +170,28 @@ class QuizDataProcessor:
         # and quiz data will be generated based on the file.
         file = self.request.FILES.get("file")
 
-        topic = self.serializer_data.get("topic_in_preferred_language")
-        number_of_questions = self.serializer_data.get("number_of_questions")
-        type_of_questions = self.serializer_data.get("type_of_questions")
         language = self.serializer_data.get("language")
-
-        creator_input = (f"Generate a quiz in {language} language "
-                         f"with {number_of_questions} "
-                         f"{type_of_questions} questions about {topic}.")
+        use_cache = self.serializer_data.get("use_cache", True)
+        number_of_questions = self.serializer_data.get("number_of_questions")
+        map_reduce = self.serializer_data.get("map_reduce", False)
 
         quiz_service = QuizGenerationService()
+        creator_input = quiz_service.build_creator_input(self.serializer_data)
         try:
             if file:
                 return quiz_service.generate_quiz_from_file(
                     file,
                     language,
-                    creator_input
+                    creator_input,
+                    use_cache,
+                    number_of_questions,
+                    map_reduce
                 )
-            return quiz_service.generate_quiz_data(creator_input, language)
+            return quiz_service.generate_quiz_data(
+                creator_input,
+                language,
+                use_cache=use_cache
+            )
         except QuizGenerationError as e:
             return {'error': str(e), 'status': status.HTTP_400_BAD_REQUEST}
 
@@ -147,6 +231,178 @@ class QuizDataProcessor:
                 self.view_instance.get_success_headers(serializer.data))
 
 
+class QuizGenerationJobService:
+    """
+    Service for generating quizzes in the background.
+    """
+    @staticmethod
+    def enqueue(request: Request,
+                serializer_data: dict) -> QuizGenerationJob:
+        """
+        Create a generation job and hand it over to Celery.
+
+        The uploaded file is read here, so the worker
+        only receives plain text.
+
+        :param request: Request object.
+        :param serializer_data: Validated InputSerializer data.
+
+        :return: The queued job.
+        """
+        file = request.FILES.get("file")
+        source_text = FileProcessor(file).process_file() if file else None
+
+        job = QuizGenerationJob.objects.create(
+            creator=request.user,
+            creator_input=QuizGenerationService.build_creator_input(
+                serializer_data
+            ),
+            language=serializer_data.get("language"),
+            source_text=source_text or None,
+            use_cache=serializer_data.get("use_cache", True),
+            map_reduce=serializer_data.get("map_reduce", False),
+            number_of_questions=serializer_data.get("number_of_questions"),
+        )
+        transaction.on_commit(
+            lambda: generate_quiz_job.delay(str(job.id))
+        )
+        return job
+
+    @staticmethod
+    def run(job_id: str) -> None:
+        """
+        Generate and persist the quiz of a job.
+
+        :param job_id: ID of the job.
+        """
+        # Claim the job in one UPDATE, so a task delivered twice
+        # generates the quiz only once
+        claimed = QuizGenerationJob.objects.filter(
+            id=job_id,
+            status=QuizGenerationJob.Status.QUEUED
+        ).update(
+            status=QuizGenerationJob.Status.GENERATING,
+            updated_at=timezone.now()
+        )
+        if not claimed:
+            logger.warning(f"Quiz generation job {job_id} already started")
+            return
+
+        job = QuizGenerationJob.objects.select_related(
+            "creator"
+        ).get(id=job_id)
+        try:
+            quiz_data = QuizGenerationService.generate_quiz_data(
+                job.creator_input,
+                job.language,
+                job.source_text,
+                job.use_cache,
+                job.number_of_questions,
+                job.map_reduce
+            )
+
+            job.status = QuizGenerationJob.Status.PERSISTING
+            job.save(update_fields=["status", "updated_at"])
+            serializer = QuizSerializer(data=quiz_data)
+            serializer.is_valid(raise_exception=True)
+            quiz = QuizCreator(serializer.validated_data, job.creator).create()
+
+            job.quiz = quiz
+            job.status = QuizGenerationJob.Status.DONE
+            job.save(update_fields=["quiz", "status", "updated_at"])
+        except Exception as e:
+            logger.error(
+                f"Quiz generation job {job_id} failed: {str(e)}",
+                exc_info=True
+            )
+            job.status = QuizGenerationJob.Status.FAILED
+            job.error = str(e)
+            job.save(update_fields=["status", "error", "updated_at"])
+
+
+class QuizStreamingService:
+    """
+    Service for streaming quiz generation as server-sent events.
+    """
+    def __init__(self, request: Request, serializer_data: dict) -> None:
+        """
+        Initialize the service.
+
+        :param request: Request object.
+        :param serializer_data: Validated InputSerializer data.
+        """
+        self.request = request
+        self.serializer_data = serializer_data
+
+    @staticmethod
+    def _format_event(event: str, data: dict) -> str:
+        """
+        Format a server-sent event.
+
+        :param event: Event name.
+        :param data: Event payload.
+
+        :return: Encoded event.
+        """
+        payload = json.dumps(data, cls=DjangoJSONEncoder)
+        return f"event: {event}\ndata: {payload}\n\n"
+
+    def _generate(self) -> Iterator[Tuple[str, dict]]:
+        """
+        Generate the quiz, served from the generation cache if possible.
+
+        :return: Iterator of ("question", ...) and ("quiz", ...) events.
+        """
+        file = self.request.FILES.get("file")
+        text = FileProcessor(file).process_file() if file else None
+        language = self.serializer_data.get("language")
+        creator_input = QuizGenerationService.build_creator_input(
+            self.serializer_data
+        )
+        if text:
+            text = SourceTextSelector().select(text, creator_input)
+
+        generation_cache = GenerationCache()
+        cache_key = generation_cache.make_key(creator_input, language, text)
+        if self.serializer_data.get("use_cache", True):
+            quiz_data = generation_cache.get(cache_key)
+            if quiz_data is not None:
+                for question in quiz_data.get("questions", []):
+                    yield "question", question
+                yield "quiz", quiz_data
+                return
+
+        for event, data in QuizGenerator().stream_quiz(
+            creator_input, language, text or None
+        ):
+            if event == "quiz":
+                generation_cache.set(cache_key, data)
+            yield event, data
+
+    def stream(self) -> Iterator[str]:
+        """
+        Stream the generated questions, then persist the quiz.
+
+        :return: Iterator of server-sent events.
+        """
+        try:
+            for event, data in self._generate():
+                if event == "question":
+                    yield self._format_event("question", data)
+                    continue
+
+                serializer = QuizSerializer(
+                    data=data,
+                    context={"request": self.request}
+                )
+                serializer.is_valid(raise_exception=True)
+                serializer.save()
+                yield self._format_event("quiz", serializer.data)
+        except (QuizGenerationError, ValidationError) as e:
+            logger.error(f"Quiz streaming failed: {str(e)}", exc_info=True)
+            yield self._format_event("error", {"error": str(e)})
+
+
 class QuizSubmissionCheckerService:
     """
     Service for checking quiz submissions.
@@ -168,18 +424,12 @@ class QuizSubmissionCheckerService:
             is_guest = data.get('guest', False)
             language = data.get('explanation_language', 'English')
 
-            # Get the Quiz Object
-            first_question = answer_data[0].get("question_id")
-
-            try:
-                quiz = Question.objects.get(id=first_question).quiz
-            except Question.DoesNotExist:
-                raise ValidationError(
-                    f"Question with ID {first_question} does not exist"
-                )
+            # Load the questions with their answer key and the Quiz Object
+            grader = SubmissionGrader(answer_data)
+            quiz = grader.quiz
 
             # Check the answers and save the results
-            results = QuizGenerator().check_answers(language, str(answer_data))
+            results = grader.grade(language)
 
             ai_results = copy.deepcopy(results)
 
@@ -226,7 +476,12 @@ class QuizSubmissionCheckerService:
             context={"request": request, "guest": is_guest}
         )
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+
+        def save_score():
+            quiz_score = serializer.save()
+            QuizStatsService.record_score(quiz_score)
+
+        atomic_with_retry(save_score)
 
     @staticmethod
     def _save_user_answers(graded_answers: List[Dict],
@@ -265,8 +520,11 @@ class QuizSubmissionCheckerService:
                     ), **item
                 ) for item in graded_answers]
 
-            with transaction.atomic():
+            def save_answers():
                 UserAnswer.objects.bulk_create(answers)
+                QuizStatsService.record_answers(answers)
+
+            atomic_with_retry(save_answers)
 
         except IntegrityError as e:
             logger.error(
@@ -319,3 +577,175 @@ class QuizSubmissionCheckerService:
             )
         except Exception as e:
             logger.error(f"Failed to send quiz notification: {str(e)}")
+
+
+class BatchSubmissionCheckerService:
+    """
+    Service for checking many quiz submissions in one request.
+    """
+    def __init__(self, batch_size: Optional[int] = None) -> None:
+        """
+        Initialize the service.
+
+        :param batch_size: Maximum answer items per AI model call.
+        """
+        self.batch_size = batch_size or getattr(
+            settings, "GRADING_BATCH_SIZE", 25
+        )
+
+    def process_batch_submission(self,
+                                 request: Request,
+                                 submissions: List[Dict]) -> List[Dict]:
+        """
+        Grade the submissions and save the results.
+
+        :param request: Request object.
+        :param submissions: Validated AnswerCheckerSerializer data.
+
+        :return: Result of every submission, in the submitted order.
+        """
+        user = request.user
+        results: List[Dict] = [{} for _ in submissions]
+
+        # One lookup for the questions of all submissions
+        questions = SubmissionGrader.load_questions(
+            item.get("question_id")
+            for submission in submissions
+            for item in submission.get("_user_answers", [])
+        )
+
+        graders: Dict[int, SubmissionGrader] = {}
+        for index, submission in enumerate(submissions):
+            try:
+                graders[index] = SubmissionGrader(
+                    submission.get("_user_answers", []), questions
+                )
+            except ValidationError as e:
+                results[index] = self._failure(index, e.detail)
+
+        if user.is_authenticated:
+            self._reject_retaken_quizzes(user, graders, results)
+
+        BatchGrader(self.batch_size).grade([
+            (grader, submissions[index].get(
+                "explanation_language", "English"
+            ))
+            for index, grader in graders.items()
+        ])
+
+        quiz_scores: List[QuizScore] = []
+        user_answers: List[UserAnswer] = []
+        participants: Dict[int, str] = {}
+        for index, grader in graders.items():
+            if grader.error:
+                results[index] = self._failure(index, grader.error)
+                continue
+
+            graded = grader.result()
+            guest = None
+            if not user.is_authenticated:
+                guest = (submissions[index].get("guest")
+                         or f"Guest-{uuid.uuid4()}")
+            participants[index] = user.username if guest is None else guest
+
+            quiz_scores.append(QuizScore(
+                quiz=grader.quiz,
+                user=user if guest is None else None,
+                guest=guest,
+                score=graded["user_total_score"]
+            ))
+            user_answers.extend(
+                UserAnswer(
+                    question_id=answer["question"],
+                    user=user if guest is None else None,
+                    guest=guest,
+                    answer=answer["answer"],
+                    correct=answer["correct"],
+                    explanation=answer["explanation"],
+                ) for answer in graded["answers"]
+            )
+            results[index] = {
+                "index": index,
+                "status": "graded",
+                "result": graded,
+            }
+
+        def save_submissions():
+            QuizScore.objects.bulk_create(quiz_scores)
+            UserAnswer.objects.bulk_create(user_answers)
+            QuizStatsService.record_scores(quiz_scores)
+            QuizStatsService.record_answers(user_answers)
+
+        atomic_with_retry(save_submissions)
+
+        self._notify_quiz_creators(graders, participants)
+        return results
+
+    @staticmethod
+    def _failure(index: int, error) -> Dict:
+        """
+        Build the result of a failed submission.
+
+        :param index: Position of the submission.
+        :param error: Error details.
+
+        :return: Submission result.
+        """
+        return {"index": index, "status": "failed", "error": error}
+
+    def _reject_retaken_quizzes(self,
+                                user,
+                                graders: Dict[int, SubmissionGrader],
+                                results: List[Dict]) -> None:
+        """
+        Drop submissions for quizzes the user has already taken,
+        including repeats within the batch.
+
+        :param user: Authenticated user.
+        :param graders: Graders mapped by submission position.
+        :param results: Submission results.
+        """
+        taken = set(QuizScore.objects.filter(
+            user=user,
+            quiz_id__in={grader.quiz.id for grader in graders.values()}
+        ).values_list("quiz_id", flat=True))
+
+        for index in sorted(graders):
+            quiz_id = graders[index].quiz.id
+            if quiz_id in taken:
+                del graders[index]
+                results[index] = self._failure(
+                    index, "You have already taken this quiz"
+                )
+            taken.add(quiz_id)
+
+    @staticmethod
+    def _notify_quiz_creators(graders: Dict[int, SubmissionGrader],
+                              participants: Dict[int, str]) -> None:
+        """
+        Send one notification per quiz to its creator.
+
+        :param graders: Graders mapped by submission position.
+        :param participants: Participant names mapped by position.
+        """
+        by_quiz: Dict[UUID, List[str]] = {}
+        quizzes: Dict[UUID, Quiz] = {}
+        for index, name in participants.items():
+            quiz = graders[index].quiz
+            quizzes[quiz.id] = quiz
+            by_quiz.setdefault(quiz.id, []).append(name)
+
+        for quiz_id, names in by_quiz.items():
+            quiz = quizzes[quiz_id]
+            try:
+                send_email.delay(
+                    subject="New Quiz Submissions",
+                    message=f"{', '.join(names)} completed your quiz "
+                            f"'{quiz.name}'. "
+                            f"View the results in your dashboard.",
+                    to=[quiz.creator.email]
+                )
+            except Exception as e:
+                logger.error(
+                    f"Failed to send quiz notification: {str(e)}"
+                )
@@ -0,0 +1,280 @@
+from collections import Counter
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import (Case, When, Value, F, Q, Count, Sum,
+                              IntegerField, DecimalField)
+
+from quiz_app.models import (Question, QuestionStats, QuizScore, QuizStats,
+                             UserAnswer)
+from quiz_app.utils.cache_policy import CacheVersion
+
+
+class QuizStatsService:
+    """
+    Maintains the QuizStats and QuestionStats rollups.
+
+    Submissions update the rollups incrementally, so analytics can be
+    read by primary key instead of aggregating every UserAnswer.
+    """
+
+    @staticmethod
+    def record_answers(answers: Iterable[UserAnswer]) -> None:
+        """
+        Add saved answers to the question rollups.
+
+        :param answers: Saved UserAnswer objects.
+        """
+        attempts: Counter = Counter()
+        incorrect: Counter = Counter()
+        for answer in answers:
+            attempts[answer.question_id] += 1
+            if not answer.correct:
+                incorrect[answer.question_id] += 1
+        if not attempts:
+            return
+
+        QuestionStats.objects.bulk_create(
+            [QuestionStats(question_id=q_id) for q_id in attempts],
+            ignore_conflicts=True
+        )
+        QuestionStats.objects.filter(question_id__in=attempts.keys()).update(
+            attempts=F("attempts") + Case(
+                *[When(question_id=q_id, then=Value(count))
+                  for q_id, count in attempts.items()],
+                default=Value(0),
+                output_field=IntegerField()
+            ),
+            incorrect_count=F("incorrect_count") + Case(
+                *[When(question_id=q_id, then=Value(count))
+                  for q_id, count in incorrect.items()],
+                default=Value(0),
+                output_field=IntegerField()
+            ),
+        )
+
+    @classmethod
+    def record_score(cls, quiz_score: QuizScore) -> None:
+        """
+        Add a saved score to the quiz rollup.
+
+        :param quiz_score: Saved QuizScore object.
+        """
+        cls.record_scores([quiz_score])
+
+    @staticmethod
+    def record_scores(quiz_scores: Iterable[QuizScore]) -> None:
+        """
+        Add saved scores to the quiz rollups.
+
+        :param quiz_scores: Saved QuizScore objects.
+        """
+        quiz_scores = list(quiz_scores)
+        if not quiz_scores:
+            return
+
+        participant_filter = Q()
+        for quiz_score in quiz_scores:
+            participant_filter |= Q(
+                quiz_id=quiz_score.quiz_id,
+                user_id=quiz_score.user_id,
+                guest=quiz_score.guest
+            )
+        # Participants whose only scores are the new ones are new
+        score_counts = Counter({
+            (row["quiz_id"], row["user_id"], row["guest"]): row["count"]
+            for row in QuizScore.objects.filter(participant_filter).values(
+                "quiz_id", "user_id", "guest"
+            ).annotate(count=Count("id"))
+        })
+        new_counts = Counter(
+            (s.quiz_id, s.user_id, s.guest) for s in quiz_scores
+        )
+
+        attempts: Counter = Counter()
+        participants: Counter = Counter()
+        score_sums: Dict = {}
+        for quiz_score in quiz_scores:
+            attempts[quiz_score.quiz_id] += 1
+            score_sums[quiz_score.quiz_id] = (
+                score_sums.get(quiz_score.quiz_id, Decimal(0))
+                + Decimal(quiz_score.score)
+            )
+        for key, count in new_counts.items():
+            if score_counts[key] == count:
+                participants[key[0]] += 1
+
+        CacheVersion.bump(*(f"quiz:{quiz_id}" for quiz_id in attempts))
+        QuizStats.objects.bulk_create(
+            [QuizStats(quiz_id=quiz_id) for quiz_id in attempts],
+            ignore_conflicts=True
+        )
+        QuizStats.objects.filter(quiz_id__in=attempts.keys()).update(
+            attempts=F("attempts") + Case(
+                *[When(quiz_id=quiz_id, then=Value(count))
+                  for quiz_id, count in attempts.items()],
+                default=Value(0),
+                output_field=IntegerField()
+            ),
+            participants=F("participants") + Case(
+                *[When(quiz_id=quiz_id, then=Value(count))
+                  for quiz_id, count in participants.items()],
+                default=Value(0),
+                output_field=IntegerField()
+            ),
+            score_sum=F("score_sum") + Case(
+                *[When(quiz_id=quiz_id, then=Value(score_sum))
+                  for quiz_id, score_sum in score_sums.items()],
+                default=Value(Decimal(0)),
+                output_field=DecimalField(max_digits=12, decimal_places=2)
+            ),
+        )
+
+    @staticmethod
+    def get_hardest_questions(quiz_id) -> List[Dict]:
+        """
+        Get the questions of a quiz ordered by their incorrect percentage.
+
+        :param quiz_id: ID of the quiz.
+
+        :return: Questions and their incorrect percentage.
+        """
+        return list(
+            QuestionStats.objects.filter(
+                question__quiz_id=quiz_id,
+                attempts__gt=0
+            ).annotate(
+                incorrect_percentage=(
+                    F("incorrect_count") * 100.0 / F("attempts")
+                )
+            ).order_by(
+                "-incorrect_percentage"
+            ).values(
+                "question__question",
+                "incorrect_percentage"
+            )
+        )
+
+    @staticmethod
+    def compute(quiz_ids: Optional[List] = None
+                ) -> Tuple[Dict, Dict]:
+        """
+        Compute the rollups from the raw submissions.
+
+        :param quiz_ids: Quizzes to compute, all quizzes if None.
+
+        :return: Tuple of (quiz rollups, question rollups) keyed by ID.
+        """
+        scores = QuizScore.objects.all()
+        answers = UserAnswer.objects.all()
+        if quiz_ids is not None:
+            scores = scores.filter(quiz_id__in=quiz_ids)
+            answers = answers.filter(question__quiz_id__in=quiz_ids)
+
+        quiz_rollups = {
+            row["quiz_id"]: {
+                "attempts": row["attempts"],
+                "participants": row["users"] + row["guests"],
+                "score_sum": row["score_sum"] or Decimal(0),
+            }
+            for row in scores.values("quiz_id").annotate(
+                attempts=Count("id"),
+                users=Count("user", distinct=True),
+                guests=Count("guest", distinct=True),
+                score_sum=Sum("score"),
+            )
+        }
+        question_rollups = {
+            row["question_id"]: {
+                "attempts": row["attempts"],
+                "incorrect_count": row["incorrect_count"],
+            }
+            for row in answers.values("question_id").annotate(
+                attempts=Count("id"),
+                incorrect_count=Count("id", filter=Q(correct=False)),
+            )
+        }
+        return quiz_rollups, question_rollups
+
+    @classmethod
+    @transaction.atomic
+    def rebuild(cls, quiz_ids: Optional[List] = None) -> None:
+        """
+        Replace the rollups with values computed from raw submissions.
+        The cached responses of the affected quizzes are orphaned once
+        the rebuild is committed.
+
+        :param quiz_ids: Quizzes to rebuild, all quizzes if None.
+        """
+        quiz_rollups, question_rollups = cls.compute(quiz_ids)
+
+        quiz_stats = QuizStats.objects.all()
+        question_stats = QuestionStats.objects.all()
+        if quiz_ids is not None:
+            quiz_stats = quiz_stats.filter(quiz_id__in=quiz_ids)
+            question_stats = question_stats.filter(
+                question__quiz_id__in=quiz_ids
+            )
+        stale_quiz_ids = set(quiz_rollups)
+        stale_quiz_ids.update(quiz_stats.values_list("quiz_id", flat=True))
+        CacheVersion.bump(*(f"quiz:{quiz_id}" for quiz_id in stale_quiz_ids))
+
+        quiz_stats.delete()
+        question_stats.delete()
+
+        QuizStats.objects.bulk_create([
+            QuizStats(quiz_id=quiz_id, **values)
+            for quiz_id, values in quiz_rollups.items()
+        ])
+        QuestionStats.objects.bulk_create([
+            QuestionStats(question_id=question_id, **values)
+            for question_id, values in question_rollups.items()
+        ])
+
+    @classmethod
+    def verify(cls, quiz_ids: Optional[List] = None) -> List[str]:
+        """
+        Compare the rollups with values computed from raw submissions.
+
+        :param quiz_ids: Quizzes to verify, all quizzes if None.
+
+        :return: Descriptions of the mismatches.
+        """
+        quiz_rollups, question_rollups = cls.compute(quiz_ids)
+        empty_quiz = {"attempts": 0, "participants": 0, "score_sum": 0}
+        empty_question = {"attempts": 0, "incorrect_count": 0}
+
+        quiz_stats = QuizStats.objects.values(
+            "quiz_id", "attempts", "participants", "score_sum"
+        )
+        question_ids = Question.objects.all()
+        if quiz_ids is not None:
+            quiz_stats = quiz_stats.filter(quiz_id__in=quiz_ids)
+            question_ids = question_ids.filter(quiz_id__in=quiz_ids)
+        question_stats = QuestionStats.objects.filter(
+            question_id__in=question_ids.values("id")
+        ).values("question_id", "attempts", "incorrect_count")
+
+        stored_quizzes = {row.pop("quiz_id"): row for row in quiz_stats}
+        stored_questions = {
+            row.pop("question_id"): row for row in question_stats
+        }
+
+        errors = []
+        for quiz_id in stored_quizzes.keys() | quiz_rollups.keys():
+            stored = stored_quizzes.get(quiz_id, empty_quiz)
+            expected = quiz_rollups.get(quiz_id, empty_quiz)
+            if any(stored[key] != expected[key] for key in empty_quiz):
+                errors.append(
+                    f"Quiz {quiz_id}: stored {stored}, expected {expected}"
+                )
+        for question_id in stored_questions.keys() | question_rollups.keys():
+            stored = stored_questions.get(question_id, empty_question)
+            expected = question_rollups.get(question_id, empty_question)
+            if any(stored[key] != expected[key] for key in empty_question):
+                errors.append(
+                    f"Question {question_id}: stored {stored}, "
+                    f"expected {expected}"
+                )
+        return errors
@@ -0,0 +1,88 @@
+import json
+from typing import Dict, List, Optional, Tuple
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from quiz_app.models import Answer, Question, Quiz, QuizPayload
+
+
+class StudentPayloadService:
+    """
+    Builds and reads the student view of quizzes.
+
+    The payload has the shape of ``QuizSerializer`` without
+    ``Answer.correct`` and is stored as compact JSON bytes, so serving
+    a quiz to students is a single-row fetch without serializer work.
+    """
+
+    @staticmethod
+    def render(quiz: Quiz) -> bytes:
+        """
+        Render the student view of a quiz from the database.
+
+        :param quiz: Quiz instance.
+
+        :return: JSON bytes.
+        """
+        answers: Dict[int, List[Dict]] = {}
+        for answer in Answer.objects.filter(
+                question__quiz=quiz
+        ).order_by("id").values("id", "answer", "question_id"):
+            answers.setdefault(answer.pop("question_id"), []).append(answer)
+
+        payload = {
+            "id": quiz.pk,
+            "name": quiz.name,
+            "question_count": quiz.question_count,
+            "total_score": quiz.total_score,
+            "questions": [
+                {**question, "answers": answers.get(question["id"], [])}
+                for question in Question.objects.filter(
+                    quiz=quiz
+                ).order_by("id").values("id", "question", "score")
+            ],
+        }
+        return json.dumps(
+            payload,
+            cls=DjangoJSONEncoder,
+            ensure_ascii=False,
+            separators=(",", ":")
+        ).encode("utf-8")
+
+    @classmethod
+    def refresh(cls, quiz: Quiz) -> bytes:
+        """
+        Rebuild and store the student view of a quiz.
+
+        :param quiz: Quiz instance.
+
+        :return: JSON bytes.
+        """
+        content = cls.render(quiz)
+        QuizPayload.objects.update_or_create(
+            quiz=quiz,
+            defaults={"content": content}
+        )
+        return content
+
+    @classmethod
+    def load(cls, quiz_id) -> Optional[Tuple[bytes, int]]:
+        """
+        Load the stored student view of a quiz. Quizzes created before
+        payloads were stored get theirs built on first use.
+
+        :param quiz_id: ID of the quiz.
+
+        :return: Tuple of (JSON bytes, creator ID) or None if the
+        quiz does not exist.
+        """
+        row = QuizPayload.objects.filter(quiz_id=quiz_id).values_list(
+            "content", "quiz__creator_id"
+        ).first()
+        if row is not None:
+            return bytes(row[0]), row[1]
+
+        quiz = Quiz.objects.filter(pk=quiz_id).first()
+        if quiz is None:
+            return None
+        return cls.refresh(quiz), quiz.creator_id
@@ -0,0 +1,191 @@
+import math
+import re
+from collections import Counter
+from typing import List, Optional
+
+from django.conf import settings
+
+STOP_WORDS = frozenset("""
+a about above after again all also an and any are as at be because been
+before being below between both but by can choice could did do does doing down
+during each few for from further generate had has have having he her here
+hers him his how i if in into is it its just language me more most multiple
+my no none nor not of off on once only open or other our out over own question
+questions quiz same she should so some such than that the their them then
+there these they this those through to too under until up very was we were
+what when where which while who whom why will with would you your
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase word tokens.
+
+    :param text: Text to tokenize.
+    :return: List of tokens.
+    """
+    return re.findall(r"\w+", text.casefold())
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of model tokens in a text.
+    Roughly four characters make one token.
+
+    :param text: Text to measure.
+    :return: Estimated token count.
+    """
+    return math.ceil(len(text) / 4)
+
+
+class SourceTextSelector:
+    """
+    Selects the parts of a source document which fit into the prompt.
+
+    The text is split into chunks, the chunks are scored against the
+    creator input with BM25 and the best ones are kept, in their
+    original order, until the token budget is used up.
+    """
+    K1 = 1.5
+    B = 0.75
+
+    def __init__(self,
+                 token_budget: Optional[int] = None,
+                 chunk_tokens: Optional[int] = None) -> None:
+        """
+        Initialize the selector.
+
+        :param token_budget: Maximum tokens of selected text.
+        :param chunk_tokens: Target size of a chunk in tokens.
+        """
+        options = getattr(settings, "SOURCE_TEXT", {})
+        self.token_budget = token_budget or options.get("TOKEN_BUDGET", 6000)
+        self.chunk_tokens = chunk_tokens or options.get("CHUNK_TOKENS", 400)
+
+    def chunk(self, text: str) -> List[str]:
+        """
+        Split text into chunks of about ``chunk_tokens`` tokens,
+        breaking on paragraphs, then sentences, then words.
+
+        :param text: Text to split.
+        :return: List of chunks.
+        """
+        chunks: List[str] = []
+        current: List[str] = []
+        current_tokens = 0
+
+        for piece in self._split_pieces(text):
+            piece_tokens = estimate_tokens(piece)
+            if current and current_tokens + piece_tokens > self.chunk_tokens:
+                chunks.append(" ".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+
+        if current:
+            chunks.append(" ".join(current))
+        return chunks
+
+    def _split_pieces(self, text: str) -> List[str]:
+        """
+        Split text into pieces no larger than a chunk.
+
+        :param text: Text to split.
+        :return: List of pieces.
+        """
+        pieces: List[str] = []
+        for paragraph in re.split(r"\n\s*\n", text):
+            paragraph = " ".join(paragraph.split())
+            if not paragraph:
+                continue
+            if estimate_tokens(paragraph) <= self.chunk_tokens:
+                pieces.append(paragraph)
+                continue
+            for sentence in re.split(r"(?<=[.!?])\s+", paragraph):
+                if estimate_tokens(sentence) <= self.chunk_tokens:
+                    pieces.append(sentence)
+                    continue
+                words = sentence.split()
+                step = max(self.chunk_tokens // 2, 1)
+                pieces.extend(
+                    " ".join(words[i:i + step])
+                    for i in range(0, len(words), step)
+                )
+        return pieces
+
+    def score(self, chunks: List[str], query: str) -> List[float]:
+        """
+        Score chunks against the query with BM25. Without a meaningful
+        query, the most frequent terms of the document are used.
+
+        :param chunks: Chunks to score.
+        :param query: Query text.
+        :return: Score of every chunk.
+        """
+        chunk_terms = [Counter(tokenize(chunk)) for chunk in chunks]
+        document_frequency: Counter = Counter()
+        for terms in chunk_terms:
+            document_frequency.update(terms.keys())
+
+        query_terms = [
+            term for term in tokenize(query)
+            if term not in STOP_WORDS and not term.isdigit()
+        ]
+        if not query_terms:
+            collection: Counter = Counter()
+            for terms in chunk_terms:
+                collection.update(terms)
+            query_terms = [
+                term for term, _ in collection.most_common(50)
+                if term not in STOP_WORDS and not term.isdigit()
+            ][:20]
+
+        count = len(chunks)
+        average_length = (
+            sum(sum(t.values()) for t in chunk_terms) / count or 1
+        )
+        scores = []
+        for terms in chunk_terms:
+            length = sum(terms.values())
+            score = 0.0
+            for term in query_terms:
+                frequency = terms.get(term, 0)
+                if not frequency:
+                    continue
+                df = document_frequency[term]
+                idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+                score += idf * frequency * (self.K1 + 1) / (
+                    frequency + self.K1 * (
+                        1 - self.B + self.B * length / average_length
+                    )
+                )
+            scores.append(score)
+        return scores
+
+    def select(self, text: str, query: str) -> str:
+        """
+        Select the most relevant part of the text within the budget.
+
+        :param text: Source text.
+        :param query: Creator input used as the relevance query.
+        :return: Selected text.
+        """
+        if estimate_tokens(text) <= self.token_budget:
+            return text
+
+        chunks = self.chunk(text)
+        scores = self.score(chunks, query)
+        ranked = sorted(
+            range(len(chunks)), key=lambda i: (-scores[i], i)
+        )
+
+        selected = []
+        used_tokens = 0
+        for index in ranked:
+            chunk_tokens = estimate_tokens(chunks[index])
+            if used_tokens + chunk_tokens > self.token_budget:
+                continue
+            selected.append(index)
+            used_tokens += chunk_tokens
+
+        return "\n\n".join(chunks[i] for i in sorted(selected))
@@ -1,15 +1,30 @@
+import hashlib
+import json
+import logging
 import os
+import time
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import pdfkit
-from django.template.loader import get_template
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.text import slugify
 from rest_framework.request import Request
 
+from quiz_app.utils.worksheet_renderers import get_renderer
+
+logger = logging.getLogger(__name__)
+
 
 class ExportToWorksheet:
     """
     Export quiz data to a worksheet.
     """
-    def __init__(self, request: Request, data: dict):
+    def __init__(self, request: Optional[Request], data: dict):
         """
         Initialize the class.
 
@@ -33,36 +48,310 @@ class ExportToWorksheet:
         }
         return context
 
+    def render(self, output_path: str) -> None:
+        """
+        Render the worksheet PDF with the configured renderer.
+
+        :param output_path: Path of the PDF file.
+        """
+        get_renderer().render(self._prepare_context(), output_path)
+
     def create_worksheet(self):
         """
         Create a worksheet.
 
         :return: File url or error message.
         """
-        template = get_template("worksheet_template.html")
-        context = self._prepare_context()
-
-        output_text = template.render(context)
-        config_path = os.getenv("WKHTMLTOPDF_PATH")
-        config = pdfkit.configuration(wkhtmltopdf=config_path)
-
         current_date = datetime.now().strftime("%d-%m-%Y-%H-%M-%S")
         output_path = f"media/{current_date}-{self.request.user}.pdf"
-        pdf_options = {
-            'enable-local-file-access': '',
-            'user-style-sheet': "static/styles.css",
-            'encoding': 'UTF-8',
-            'quiet': ''
-        }
         try:
-            pdfkit.from_string(output_text,
-                               output_path,
-                               configuration=config,
-                               options=pdf_options)
+            self.render(output_path)
             download_url = (f"{self.request.scheme}://"
                             f"{self.request.get_host()}/"
                             f"{output_path}")
             return {"download_url": download_url}
         except Exception as e:
             return {"error": str(e)}
-        return output_path
+
+
+class WorksheetArtifactStore:
+    """
+    Stores rendered worksheets under a key derived from the quiz ID
+    and a hash of its content, so an unchanged quiz is rendered once.
+
+    Artifacts of older quiz versions are removed after every render
+    and the directory is kept under a size limit by evicting the
+    least recently used files.
+    """
+    DIRECTORY = "worksheets"
+
+    def __init__(self) -> None:
+        options = getattr(settings, "WORKSHEET_CACHE", {})
+        self.root = Path(settings.MEDIA_ROOT) / self.DIRECTORY
+        self.max_bytes = options.get("MAX_BYTES", 500 * 1024 * 1024)
+        self.pending_timeout = options.get("PENDING_TIMEOUT", 5 * 60)
+        self.workers = options.get("WORKERS", 4)
+
+    @staticmethod
+    def get_name(data: dict) -> str:
+        """
+        Get the artifact file name of serialized quiz data. Changing
+        the renderer changes the name as well.
+
+        :param data: Serialized quiz data.
+
+        :return: File name.
+        """
+        content = json.dumps(
+            [data, getattr(settings, "WORKSHEET_RENDERER", "pdfkit")],
+            sort_keys=True,
+            default=str
+        )
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:32]
+        return f"{data.get('id')}-{digest}.pdf"
+
+    def get_path(self, name: str) -> Path:
+        """
+        Get the path of an artifact.
+
+        :param name: Artifact file name.
+
+        :return: File path.
+        """
+        return self.root / name
+
+    def get_url(self, request: Request, name: str) -> str:
+        """
+        Get the download URL of an artifact.
+
+        :param request: Request object.
+        :param name: Artifact file name.
+
+        :return: Absolute URL.
+        """
+        return request.build_absolute_uri(
+            f"{settings.MEDIA_URL}{self.DIRECTORY}/{name}"
+        )
+
+    def get(self, name: str) -> Optional[Path]:
+        """
+        Get an existing artifact and mark it as recently used.
+
+        :param name: Artifact file name.
+
+        :return: File path or None if it is not rendered yet.
+        """
+        path = self.get_path(name)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def mark_pending(self, name: str) -> bool:
+        """
+        Mark an artifact as being rendered.
+
+        A marker file is used so the web and worker processes agree
+        without a shared cache. Markers older than the pending
+        timeout are treated as abandoned.
+
+        :param name: Artifact file name.
+
+        :return: False if a render is already pending.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        marker = self.get_path(name).with_suffix(".pending")
+        try:
+            if time.time() - marker.stat().st_mtime < self.pending_timeout:
+                return False
+            marker.unlink(missing_ok=True)
+        except FileNotFoundError:
+            pass
+        try:
+            os.close(os.open(marker, os.O_CREAT | os.O_EXCL))
+        except FileExistsError:
+            return False
+        return True
+
+    def pop_error(self, name: str) -> Optional[str]:
+        """
+        Get and clear the error of a failed render.
+
+        :param name: Artifact file name.
+
+        :return: Error message or None.
+        """
+        error_path = self.get_path(name).with_suffix(".error")
+        try:
+            error = error_path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        error_path.unlink(missing_ok=True)
+        return error
+
+    def export(self, request: Request, data: dict) -> Tuple[dict, int]:
+        """
+        Get the worksheet of a quiz, scheduling a render if needed.
+
+        :param request: Request object.
+        :param data: Serialized quiz data.
+
+        :return: Tuple of (response data, HTTP status code).
+        """
+        from quiz_app.tasks import render_worksheet
+
+        name = self.get_name(data)
+        if self.get(name):
+            return {"download_url": self.get_url(request, name)}, 200
+
+        error = self.pop_error(name)
+        if error is not None:
+            return {"error": error}, 500
+
+        if self.mark_pending(name):
+            # Celery only accepts JSON, decimals are sent as strings
+            payload = json.loads(json.dumps(data, cls=DjangoJSONEncoder))
+            render_worksheet.delay(payload, name)
+        return {"status": "pending"}, 202
+
+    def export_many(self,
+                    request: Request,
+                    quizzes: List[dict]) -> Tuple[dict, int]:
+        """
+        Get a ZIP archive with the worksheets of many quizzes,
+        scheduling a render if needed.
+
+        :param request: Request object.
+        :param quizzes: Serialized data of every quiz.
+
+        :return: Tuple of (response data, HTTP status code).
+        """
+        from quiz_app.tasks import render_worksheet_archive
+
+        names = [self.get_name(data) for data in quizzes]
+        digest = hashlib.sha256(
+            "|".join(names).encode("utf-8")
+        ).hexdigest()[:32]
+        archive_name = f"bulk-{digest}.zip"
+        if self.get(archive_name):
+            return {"download_url": self.get_url(request, archive_name)}, 200
+
+        error = self.pop_error(archive_name)
+        if error is not None:
+            return {"error": error}, 500
+
+        if self.mark_pending(archive_name):
+            payload = json.loads(json.dumps(quizzes, cls=DjangoJSONEncoder))
+            render_worksheet_archive.delay(payload, archive_name)
+        return {"status": "pending"}, 202
+
+    def _render_artifact(self, data: dict, name: str) -> Optional[str]:
+        """
+        Render an artifact unless it already exists.
+
+        :param data: Serialized quiz data.
+        :param name: Artifact file name.
+
+        :return: Error message or None on success.
+        """
+        if self.get(name):
+            return None
+        path = self.get_path(name)
+        # Concurrent renders of the same quiz must not share a file
+        temporary_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        try:
+            ExportToWorksheet(None, data).render(str(temporary_path))
+            os.replace(temporary_path, path)
+        except Exception as e:
+            logger.error(f"Worksheet render failed: {str(e)}", exc_info=True)
+            temporary_path.unlink(missing_ok=True)
+            return str(e)
+        return None
+
+    def render(self, data: dict, name: str) -> None:
+        """
+        Render an artifact and evict stale ones.
+
+        :param data: Serialized quiz data.
+        :param name: Artifact file name.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.get_path(name)
+        try:
+            error = self._render_artifact(data, name)
+            if error is not None:
+                path.with_suffix(".error").write_text(error, encoding="utf-8")
+        finally:
+            path.with_suffix(".pending").unlink(missing_ok=True)
+        self.evict(keep=[name])
+
+    def render_archive(self, quizzes: List[dict], archive_name: str) -> None:
+        """
+        Render the worksheets of many quizzes into a ZIP archive.
+
+        Worksheets which are already stored are reused, the others
+        are rendered concurrently and stored for later exports.
+
+        :param quizzes: Serialized data of every quiz.
+        :param archive_name: Archive file name.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        archive_path = self.get_path(archive_name)
+        names = [self.get_name(data) for data in quizzes]
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                errors = [
+                    error for error in executor.map(
+                        self._render_artifact, quizzes, names
+                    ) if error is not None
+                ]
+            if errors:
+                archive_path.with_suffix(".error").write_text(
+                    f"{len(errors)} of {len(quizzes)} worksheets failed: "
+                    f"{errors[0]}",
+                    encoding="utf-8"
+                )
+                return
+
+            temporary_path = archive_path.with_suffix(".tmp")
+            with zipfile.ZipFile(temporary_path, "w",
+                                 zipfile.ZIP_DEFLATED) as archive:
+                for index, (data, name) in enumerate(zip(quizzes, names),
+                                                     start=1):
+                    title = slugify(data.get("name") or "") or "quiz"
+                    archive.write(self.get_path(name),
+                                  f"{index:03d}-{title}.pdf")
+            os.replace(temporary_path, archive_path)
+        finally:
+            archive_path.with_suffix(".pending").unlink(missing_ok=True)
+        self.evict(keep=[archive_name, *names])
+
+    def evict(self, keep: Iterable[str] = ()) -> None:
+        """
+        Remove worksheets of older quiz versions and the least recently
+        used artifacts above the size limit.
+
+        :param keep: Artifact file names which are never removed.
+        """
+        keep = set(keep)
+        files = sorted(
+            (path for path in self.root.iterdir()
+             if path.suffix in (".pdf", ".zip") and path.is_file()),
+            key=lambda path: path.stat().st_mtime,
+            reverse=True
+        )
+        kept_quizzes = {
+            name.rsplit("-", 1)[0] for name in keep if name.endswith(".pdf")
+        }
+        for path in list(files):
+            if (path.suffix == ".pdf" and path.name not in keep
+                    and path.name.rsplit("-", 1)[0] in kept_quizzes):
+                path.unlink(missing_ok=True)
+                files.remove(path)
+
+        total_bytes = 0
+        for path in files:
+            total_bytes += path.stat().st_size
+            if total_bytes > self.max_bytes and path.name not in keep:
+                path.unlink(missing_ok=True)
@@ -0,0 +1,422 @@
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional
+
+import pdfkit
+from django.conf import settings
+from django.template.loader import get_template
+
+logger = logging.getLogger(__name__)
+
+
+class WorksheetRenderer(ABC):
+    """
+    Base class of the worksheet PDF renderers.
+    """
+    @abstractmethod
+    def render(self, context: Dict, output_path: str) -> None:
+        """
+        Render the worksheet PDF.
+
+        :param context: Worksheet context with ``quiz_name``
+        and ``questions``.
+        :param output_path: Path of the PDF file.
+        """
+
+
+class PdfkitRenderer(WorksheetRenderer):
+    """
+    Renders ``worksheet_template.html`` with wkhtmltopdf. The template
+    is compiled once per process.
+    """
+    _template = None
+
+    PDF_OPTIONS = {
+        'enable-local-file-access': '',
+        'user-style-sheet': "static/styles.css",
+        'encoding': 'UTF-8',
+        'quiet': ''
+    }
+
+    def render(self, context: Dict, output_path: str) -> None:
+        if PdfkitRenderer._template is None:
+            PdfkitRenderer._template = get_template("worksheet_template.html")
+        output_text = PdfkitRenderer._template.render(context)
+        config_path = os.getenv("WKHTMLTOPDF_PATH")
+        config = pdfkit.configuration(wkhtmltopdf=config_path)
+
+        pdfkit.from_string(output_text,
+                           output_path,
+                           configuration=config,
+                           options=self.PDF_OPTIONS)
+
+
+class NativeRenderer(WorksheetRenderer):
+    """
+    Writes the worksheet PDF directly from the quiz data in-process.
+
+    The layout follows ``worksheet_template.html`` and only uses the
+    standard Helvetica fonts, so nothing is embedded. Text is encoded
+    as WinAnsi, so quizzes with characters outside it, e.g. Georgian,
+    are rendered by the pdfkit renderer instead.
+    """
+    ENCODING = "cp1252"
+    PAGE_WIDTH = 595
+    PAGE_HEIGHT = 842
+    MARGIN = 50
+    # Helvetica advance widths of the printable ASCII characters
+    CHAR_WIDTHS = dict(zip(
+        (chr(code) for code in range(32, 127)),
+        [278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278,
+         333, 278, 278, 556, 556, 556, 556, 556, 556, 556, 556, 556, 556,
+         278, 278, 584, 584, 584, 556, 1015, 667, 667, 722, 722, 667, 611,
+         778, 722, 278, 500, 667, 556, 833, 722, 778, 667, 778, 722, 667,
+         611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556, 333,
+         556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833,
+         556, 556, 556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500,
+         334, 260, 334, 584]
+    ))
+    DEFAULT_WIDTH = 556
+    BOLD_FACTOR = 1.06
+
+    def __init__(self) -> None:
+        self.pages: List[List[str]] = []
+        self.y = 0.0
+
+    def _text_width(self, text: str, size: float, bold: bool) -> float:
+        """
+        Measure the width of a text.
+
+        :param text: Text to measure.
+        :param size: Font size.
+        :param bold: Whether the bold font is used.
+
+        :return: Width in points.
+        """
+        width = sum(self.CHAR_WIDTHS.get(c, self.DEFAULT_WIDTH) for c in text)
+        return width * size / 1000 * (self.BOLD_FACTOR if bold else 1)
+
+    def _wrap(self,
+              text: str,
+              size: float,
+              bold: bool,
+              max_width: float) -> List[str]:
+        """
+        Wrap a text into lines that fit the given width.
+
+        :param text: Text to wrap.
+        :param size: Font size.
+        :param bold: Whether the bold font is used.
+        :param max_width: Maximum line width.
+
+        :return: Lines of the text.
+        """
+        lines: List[str] = []
+        line = ""
+        for word in str(text).split():
+            candidate = f"{line} {word}" if line else word
+            if self._text_width(candidate, size, bold) <= max_width:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+            # Words longer than a line are broken by characters
+            while self._text_width(word, size, bold) > max_width:
+                cut = len(word)
+                while cut > 1 and self._text_width(
+                        word[:cut], size, bold) > max_width:
+                    cut -= 1
+                lines.append(word[:cut])
+                word = word[cut:]
+            line = word
+        if line:
+            lines.append(line)
+        return lines or [""]
+
+    @staticmethod
+    def _escape(text: str) -> str:
+        """
+        Escape a text for a PDF string literal.
+
+        :param text: Text to escape.
+
+        :return: Escaped text.
+        """
+        return (text.replace("\\", "\\\\")
+                .replace("(", "\\(")
+                .replace(")", "\\)"))
+
+    def _new_page(self) -> None:
+        """
+        Start a new page.
+        """
+        self.pages.append([])
+        self.y = self.PAGE_HEIGHT - self.MARGIN
+
+    def _reserve(self, height: float) -> None:
+        """
+        Start a new page if the remaining space is too small.
+
+        :param height: Required height.
+        """
+        if self.y - height < self.MARGIN:
+            self._new_page()
+
+    def _draw_text(self,
+                   text: str,
+                   x: float,
+                   size: float,
+                   bold: bool = False) -> None:
+        """
+        Draw one line of text on the current line position.
+
+        :param text: Text to draw.
+        :param x: Horizontal position.
+        :param size: Font size.
+        :param bold: Whether the bold font is used.
+        """
+        font = "F2" if bold else "F1"
+        self.pages[-1].append(
+            f"BT /{font} {size} Tf {x:.2f} {self.y:.2f} Td "
+            f"({self._escape(text)}) Tj ET"
+        )
+
+    def _draw_paragraph(self,
+                        text: str,
+                        x: float,
+                        size: float,
+                        bold: bool = False) -> None:
+        """
+        Draw a wrapped text and move below it.
+
+        :param text: Text to draw.
+        :param x: Horizontal position.
+        :param size: Font size.
+        :param bold: Whether the bold font is used.
+        """
+        leading = size * 1.4
+        max_width = self.PAGE_WIDTH - self.MARGIN - x
+        for line in self._wrap(text, size, bold, max_width):
+            self._reserve(leading)
+            self.y -= size
+            self._draw_text(line, x, size, bold)
+            self.y -= leading - size
+
+    def _draw_rect(self,
+                   x: float,
+                   y: float,
+                   width: float,
+                   height: float) -> None:
+        """
+        Draw a rectangle outline.
+
+        :param x: Left edge.
+        :param y: Bottom edge.
+        :param width: Width.
+        :param height: Height.
+        """
+        self.pages[-1].append(
+            f"{x:.2f} {y:.2f} {width:.2f} {height:.2f} re S"
+        )
+
+    def _draw_header(self) -> None:
+        """
+        Draw the student information fields.
+        """
+        self.y -= 12
+        right_x = self.PAGE_WIDTH - self.MARGIN - 150
+        for index, label in enumerate(["Student Name:", "Class Name:"]):
+            self._draw_text(label, self.MARGIN, 11, bold=True)
+            if index == 0:
+                self._draw_text("Date:", right_x, 11, bold=True)
+                self._draw_line(right_x + 35, self.PAGE_WIDTH - self.MARGIN)
+            self._draw_line(self.MARGIN + 85, self.MARGIN + 260)
+            self.y -= 22
+        self.y -= 10
+
+    def _draw_line(self, start_x: float, end_x: float) -> None:
+        """
+        Draw a horizontal line under the current text line.
+
+        :param start_x: Left end.
+        :param end_x: Right end.
+        """
+        self.pages[-1].append(
+            f"{start_x:.2f} {self.y - 2:.2f} m "
+            f"{end_x:.2f} {self.y - 2:.2f} l S"
+        )
+
+    def _draw_question(self, number: int, item: Dict) -> None:
+        """
+        Draw a question with its answers or an answer box.
+
+        :param number: Question number.
+        :param item: Serialized question.
+        """
+        self._reserve(60)
+        self._draw_paragraph(
+            f"{number}. {item.get('question', '')}", self.MARGIN, 12, True
+        )
+        self._draw_paragraph(f"Score: {item.get('score', '')}",
+                             self.MARGIN, 10)
+
+        answers = item.get("answers") or []
+        for index, answer in enumerate(answers, start=1):
+            self._reserve(16)
+            self._draw_rect(self.MARGIN + 12, self.y - 10, 8, 8)
+            self._draw_paragraph(
+                f"{index}. {answer.get('answer', '')}", self.MARGIN + 26, 11
+            )
+        if not answers:
+            self._reserve(70)
+            self.y -= 64
+            self._draw_rect(
+                self.MARGIN, self.y,
+                self.PAGE_WIDTH - 2 * self.MARGIN, 60
+            )
+        self.y -= 14
+
+    def _build(self, context: Dict) -> bytes:
+        """
+        Lay out the worksheet and serialize the PDF document.
+
+        :param context: Worksheet context.
+
+        :return: PDF bytes.
+        """
+        self.pages = []
+        self._new_page()
+        self._draw_header()
+
+        title = str(context.get("quiz_name") or "")
+        title_lines = self._wrap(
+            title, 18, True, self.PAGE_WIDTH - 2 * self.MARGIN
+        )
+        for line in title_lines:
+            self.y -= 18
+            x = (self.PAGE_WIDTH - self._text_width(line, 18, True)) / 2
+            self._draw_text(line, x, 18, bold=True)
+            self.y -= 8
+        self.y -= 16
+
+        for number, item in enumerate(context.get("questions") or [],
+                                      start=1):
+            self._draw_question(number, item)
+
+        self._reserve(30)
+        self._draw_paragraph(
+            "Complete all questions. Good luck!", self.MARGIN, 11
+        )
+        return self._serialize()
+
+    def _serialize(self) -> bytes:
+        """
+        Serialize the laid out pages into a PDF document.
+
+        :return: PDF bytes.
+        """
+        objects: List[bytes] = [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            b"",
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+            b"/Encoding /WinAnsiEncoding >>",
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold "
+            b"/Encoding /WinAnsiEncoding >>",
+        ]
+        page_ids: List[int] = []
+        for operations in self.pages:
+            stream = "\n".join(operations).encode(self.ENCODING)
+            objects.append(
+                b"<< /Length %d >>\nstream\n%s\nendstream"
+                % (len(stream), stream)
+            )
+            objects.append(
+                b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+                b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> "
+                b"/Contents %d 0 R >>"
+                % (self.PAGE_WIDTH, self.PAGE_HEIGHT, len(objects))
+            )
+            page_ids.append(len(objects))
+        objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            b" ".join(b"%d 0 R" % page_id for page_id in page_ids),
+            len(page_ids)
+        )
+
+        document = bytearray(b"%PDF-1.4\n")
+        offsets: List[int] = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(len(document))
+            document += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+        xref_offset = len(document)
+        document += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+        for offset in offsets:
+            document += b"%010d 00000 n \n" % offset
+        document += (b"trailer\n<< /Size %d /Root 1 0 R >>\n"
+                     b"startxref\n%d\n%%%%EOF\n"
+                     % (len(objects) + 1, xref_offset))
+        return bytes(document)
+
+    @staticmethod
+    def _iter_texts(context: Dict) -> Iterator[str]:
+        """
+        Iterate over the texts drawn on the worksheet.
+
+        :param context: Worksheet context.
+
+        :return: Iterator of texts.
+        """
+        yield str(context.get("quiz_name") or "")
+        for item in context.get("questions") or []:
+            yield str(item.get("question", ""))
+            yield str(item.get("score", ""))
+            for answer in item.get("answers") or []:
+                yield str(answer.get("answer", ""))
+
+    @classmethod
+    def supports(cls, context: Dict) -> bool:
+        """
+        Check whether all texts of a worksheet can be encoded as WinAnsi.
+
+        :param context: Worksheet context.
+
+        :return: True if the native renderer can draw the worksheet.
+        """
+        try:
+            for text in cls._iter_texts(context):
+                text.encode(cls.ENCODING)
+        except UnicodeEncodeError:
+            return False
+        return True
+
+    def render(self, context: Dict, output_path: str) -> None:
+        if not self.supports(context):
+            logger.info("Worksheet text is not WinAnsi, rendering it "
+                        "with pdfkit")
+            PdfkitRenderer().render(context, output_path)
+            return
+        with open(output_path, "wb") as file:
+            file.write(self._build(context))
+
+
+RENDERERS = {
+    "pdfkit": PdfkitRenderer,
+    "native": NativeRenderer,
+}
+
+
+def get_renderer(name: Optional[str] = None) -> WorksheetRenderer:
+    """
+    Get a worksheet renderer.
+
+    :param name: Name of the renderer, ``WORKSHEET_RENDERER``
+    setting by default.
+
+    :return: Renderer instance.
+
+    :raises ValueError: If the renderer is unknown.
+    """
+    name = name or getattr(settings, "WORKSHEET_RENDERER", "pdfkit")
+    if name not in RENDERERS:
+        raise ValueError(f"Unknown worksheet renderer: {name}")
+    return RENDERERS[name]()
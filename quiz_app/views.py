@@ -1,19 +1,30 @@
 import logging
 
+from django.db import transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.http import parse_etags
 from rest_framework import status
 from rest_framework.decorators import action
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet, GenericViewSet
-from rest_framework.mixins import CreateModelMixin
+from rest_framework.mixins import CreateModelMixin, RetrieveModelMixin
 
 from mixins.error_handling_mixin import ErrorHandlingMixin
+from .utils.cache_policy import CacheMetrics, CacheVersion
 from .utils.helpers.serializer_utils import SerializerFactory
-from .utils.paginators import CustomPaginator
-from .utils.services import QuizDataProcessor, QuizSubmissionCheckerService
+from .utils.openai_client import OpenAIClientRegistry
+from .utils.paginators import SelectablePaginator
+from .utils.quiz_cache import QuizPayloadCache
+from .utils.services import (QuizDataProcessor,
+                             QuizSubmissionCheckerService,
+                             QuizGenerationJobService,
+                             QuizStreamingService,
+                             BatchSubmissionCheckerService)
 from .serializers import *
 from .permissions import IsCreator, CanSeeAnalysis
-from .utils.worksheet import ExportToWorksheet
+from .utils.worksheet import WorksheetArtifactStore
 
 logger = logging.getLogger(__name__)
 
@@ -31,9 +42,11 @@ class QuizViewSet(ErrorHandlingMixin, ModelViewSet):
     """
     serializer_class = SerializerFactory(  # type: ignore
         create=InputSerializer,
+        stream=InputSerializer,
         default=QuizSerializer
     )
-    pagination_class = CustomPaginator
+    pagination_class = SelectablePaginator
+    pagination_mode = "cursor"
     queryset = Quiz.objects.prefetch_related(
                 "questions",
                 "questions__answers"
@@ -41,6 +54,7 @@ class QuizViewSet(ErrorHandlingMixin, ModelViewSet):
 
     permission_classes_map = {
         "create": [IsAuthenticated()],
+        "stream": [IsAuthenticated()],
         "list": [IsAuthenticated()],
         "update": [IsCreator()],
         "destroy": [IsCreator()],
@@ -59,6 +73,48 @@ class QuizViewSet(ErrorHandlingMixin, ModelViewSet):
             super().get_permissions()
         )
 
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Quiz retrieval endpoint. Students get the pre-rendered quiz
+        without the correct answers from the cache, and requests with a
+        matching If-None-Match header get 304 Not Modified. The creator
+        gets the full quiz.
+
+        :param request: Request object.
+        :param args: arguments.
+        :param kwargs: keyword arguments.
+
+        :return: Response object.
+        """
+        entry = QuizPayloadCache().get(kwargs.get("pk"))
+        if request.user.is_authenticated \
+                and request.user.pk == entry["creator_id"]:
+            serializer = self.get_serializer(self.get_object())
+            return Response(serializer.data, status=status.HTTP_200_OK)
+
+        headers = {"ETag": entry["etag"], "Cache-Control": "no-cache"}
+        if entry["etag"] in parse_etags(
+                request.headers.get("If-None-Match", "")):
+            return HttpResponse(status=status.HTTP_304_NOT_MODIFIED,
+                                headers=headers)
+        return HttpResponse(entry["content"],
+                            content_type="application/json",
+                            headers=headers)
+
+    def perform_destroy(self, instance):
+        """
+        Delete the quiz and orphan its cached responses. The versions
+        are bumped once the delete is committed, so a concurrent request
+        cannot cache the quiz under the new version.
+
+        :param instance: Quiz instance.
+        """
+        with transaction.atomic():
+            CacheVersion.bump(f"quiz:{instance.pk}",
+                              f"quiz-content:{instance.pk}",
+                              f"creator:{instance.creator_id}")
+            instance.delete()
+
     def create(self, request, *args, **kwargs):
         """
         Quiz creation endpoint.
@@ -72,14 +128,63 @@ class QuizViewSet(ErrorHandlingMixin, ModelViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
+        if serializer.validated_data.get("async_mode"):
+            job = QuizGenerationJobService.enqueue(
+                request,
+                serializer.validated_data
+            )
+            return Response(
+                QuizGenerationJobSerializer(job).data,
+                status=status.HTTP_202_ACCEPTED
+            )
+
         data_processor = QuizDataProcessor(request, serializer.validated_data, self)
         data, status_code, headers = data_processor.process_quiz_data()
         return Response(data, status=status_code, headers=headers)
 
+    @action(detail=False, methods=["post"])
+    def stream(self, request, *args, **kwargs):
+        """
+        Quiz creation endpoint which streams every question as a
+        server-sent event as soon as it is generated, followed by
+        the saved quiz.
+
+        :param request: Request object.
+        :param args: arguments.
+        :param kwargs: keyword arguments.
+
+        :return: StreamingHttpResponse object.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        unsupported = [
+            field for field in ("async_mode", "map_reduce")
+            if serializer.validated_data.get(field)
+        ]
+        if unsupported:
+            return Response(
+                {"error": f"Streaming does not support "
+                          f"{', '.join(unsupported)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        streaming_service = QuizStreamingService(
+            request,
+            serializer.validated_data
+        )
+        response = StreamingHttpResponse(
+            streaming_service.stream(),
+            content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
     @action(detail=True, methods=["get"], permission_classes=[CanSeeAnalysis])
     def export_to_worksheet(self, request, *args, **kwargs):
         """
-        Export quiz data to a worksheet.
+        Export quiz data to a worksheet. The worksheet is rendered in
+        the background, pending exports return 202 until it is ready.
 
         :param request: Request object.
         :param args: Arguments.
@@ -89,10 +194,36 @@ class QuizViewSet(ErrorHandlingMixin, ModelViewSet):
         """
         quiz = self.get_object()
         serializer = self.get_serializer(quiz)
-        data = serializer.data
-        export_to_worksheet = ExportToWorksheet(request, data)
-        response = export_to_worksheet.create_worksheet()
-        return Response(response, status=status.HTTP_200_OK)
+        data, status_code = WorksheetArtifactStore().export(
+            request,
+            serializer.data
+        )
+        return Response(data, status=status_code)
+
+
+class QuizGenerationJobViewSet(ErrorHandlingMixin,
+                               RetrieveModelMixin,
+                               GenericViewSet):
+    """
+    ViewSet for polling background quiz generation jobs.
+
+    retrieve: Returns the job status and the quiz once it is ready.
+    """
+    serializer_class = QuizGenerationJobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        """
+        Get the generation jobs of the current user.
+
+        :return: Queryset of generation jobs.
+        """
+        return QuizGenerationJob.objects.filter(
+            creator=self.request.user
+        ).prefetch_related(
+            "quiz__questions",
+            "quiz__questions__answers"
+        )
 
 
 class CheckAnswersViewSet(ErrorHandlingMixin,
@@ -104,9 +235,13 @@ class CheckAnswersViewSet(ErrorHandlingMixin,
     create: Process quiz submissions and return graded results.
     """
     queryset = Quiz.objects.select_related('creator')
-    serializer_class = AnswerCheckerSerializer
+    serializer_class = SerializerFactory(  # type: ignore
+        batch=BatchAnswerCheckerSerializer,
+        default=AnswerCheckerSerializer
+    )
 
     quiz_submission_service = QuizSubmissionCheckerService()
+    batch_submission_service = BatchSubmissionCheckerService()
 
     def create(self, request, *args, **kwargs):
         """
@@ -128,3 +263,49 @@ class CheckAnswersViewSet(ErrorHandlingMixin,
         )
         return Response(results, status=status.HTTP_201_CREATED)
 
+    @action(detail=False, methods=["post"])
+    def batch(self, request, *args, **kwargs):
+        """
+        Process many quiz submissions and return graded results
+        or the error of every submission.
+
+        :param request: Request object.
+        :param args: Arguments.
+        :param kwargs: Keyword arguments.
+
+        :return: Response object.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = self.batch_submission_service.process_batch_submission(
+            request,
+            serializer.validated_data["submissions"]
+        )
+        all_graded = all(r["status"] == "graded" for r in results)
+        return Response(
+            {"results": results},
+            status=(status.HTTP_201_CREATED if all_graded
+                    else status.HTTP_207_MULTI_STATUS)
+        )
+
+
+class CacheMetricsView(APIView):
+    """
+    Hit ratios of the application caches and cached views, and the
+    OpenAI client pool metrics of the serving process, for monitoring.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        """
+        Get the hits, misses and hit ratio of every cache, and the
+        OpenAI client metrics under ``openai_client``.
+
+        :param request: Request object.
+
+        :return: Response object.
+        """
+        return Response({
+            **CacheMetrics.snapshot(),
+            "openai_client": OpenAIClientRegistry.get_metrics(),
+        }, status=status.HTTP_200_OK)
@@ -152,8 +152,25 @@ class CreatedQuizDetailSerializer(serializers.Serializer):
     name = serializers.CharField()
     creator = serializers.CharField()
     total_score = serializers.FloatField()
+    question_count = serializers.IntegerField()
     users_count = serializers.IntegerField()
     users = serializers.ListField(child=serializers.DictField())
+    users_next = serializers.CharField(allow_null=True, required=False)
+
+
+class BulkWorksheetExportSerializer(serializers.Serializer):
+    """
+    Serializer for exporting the worksheets of many quizzes,
+    selected by IDs or by a filter
+    """
+    quiz_ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        required=False,
+        max_length=200
+    )
+    name = serializers.CharField(required=False)
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
 
 
 class HardestQuestionSerializer(serializers.Serializer):
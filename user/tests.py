@@ -1,3 +1,199 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from quiz_app.models import (Answer, Question, Quiz, QuizScore, QuizStats,
+                             UserAnswer)
+from quiz_app.utils.cache_policy import CacheVersion
+from quiz_app.utils.paginators import encode_cursor
+from quiz_app.utils.stats import QuizStatsService
+from user.models import User
+
+
+class TakenQuizQueriesTest(TestCase):
+    """
+    Listing and retrieving taken quizzes runs a fixed number of
+    queries and only loads the answers of the requesting user.
+    """
+    QUIZZES = 3
+    QUESTIONS = 5
+    PARTICIPANTS = 20
+
+    @classmethod
+    def setUpTestData(cls):
+        users = User.objects.bulk_create([
+            User(username=f"taken-{index}", email=f"taken-{index}@example.com")
+            for index in range(cls.PARTICIPANTS + 1)
+        ])
+        cls.user = users[0]
+        cls.quizzes = []
+        for index in range(cls.QUIZZES):
+            quiz = Quiz.objects.create(name=f"Quiz {index}", creator=users[-1])
+            questions = Question.objects.bulk_create([
+                Question(question=f"Question {number}", quiz=quiz)
+                for number in range(cls.QUESTIONS)
+            ])
+            Answer.objects.bulk_create([
+                Answer(answer=f"Answer {number}", correct=number == 0,
+                       question=question)
+                for question in questions for number in range(4)
+            ])
+            UserAnswer.objects.bulk_create([
+                UserAnswer(answer="Answer 0", correct=user.pk % 2 == 0,
+                           question=question, user=user)
+                for question in questions for user in users
+            ])
+            QuizScore.objects.bulk_create([
+                QuizScore(quiz=quiz, user=user, score=1) for user in users
+            ])
+            cls.quizzes.append(quiz)
+        # A quiz the user did not take
+        Quiz.objects.create(name="Not taken", creator=users[-1])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assertOnlyOwnAnswers(self, quiz):
+        answer_ids = {
+            answer["id"]
+            for question in quiz["questions"]
+            for answer in question["your_answers"]
+        }
+        self.assertEqual(len(answer_ids), self.QUESTIONS)
+        self.assertEqual(
+            UserAnswer.objects.filter(id__in=answer_ids, user=self.user).count(),
+            self.QUESTIONS
+        )
+
+    def test_list(self):
+        # quizzes, questions, answers and the user's answers
+        with self.assertNumQueries(4):
+            response = self.client.get("/accounts/taken-quiz/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("count", response.data)
+        self.assertIsNone(response.data["next"])
+        self.assertEqual(len(response.data["results"]), self.QUIZZES)
+        for quiz in response.data["results"]:
+            self.assertOnlyOwnAnswers(quiz)
+
+    def test_list_page_mode(self):
+        # count, quizzes, questions, answers and the user's answers
+        with self.assertNumQueries(5):
+            response = self.client.get("/accounts/taken-quiz/",
+                                       {"pagination": "page"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], self.QUIZZES)
+
+    def test_retrieve(self):
+        quiz = self.quizzes[0]
+        with self.assertNumQueries(4):
+            response = self.client.get(f"/accounts/taken-quiz/{quiz.pk}/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["your_score"], "1.00")
+        self.assertOnlyOwnAnswers(response.data)
+
+
+class ParticipantsCursorTest(TestCase):
+    """
+    Participants are paged with links, and malformed cursors are
+    rejected with a 400.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.creator = User.objects.create(username="creator",
+                                          email="creator@example.com")
+        cls.quiz = Quiz.objects.create(name="Quiz", creator=cls.creator)
+        question = Question.objects.create(question="Question", quiz=cls.quiz)
+        users = User.objects.bulk_create([
+            User(username=f"participant-{index}",
+                 email=f"participant-{index}@example.com")
+            for index in range(3)
+        ])
+        UserAnswer.objects.bulk_create([
+            UserAnswer(answer="Answer", question=question, user=user)
+            for user in users
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.creator)
+        self.url = f"/accounts/created-quiz/{self.quiz.pk}/participants/"
+
+    def test_next_links(self):
+        response = self.client.get(self.url, {"page_size": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 2)
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertIsNone(response.data["next"])
+
+    def test_detail_links_to_participants(self):
+        UserAnswer.objects.bulk_create([
+            UserAnswer(answer="Answer", question=self.quiz.questions.get(),
+                       guest=f"Guest-{index}")
+            for index in range(50)
+        ])
+        response = self.client.get(f"/accounts/created-quiz/{self.quiz.pk}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data["users_next"].startswith(
+            f"http://testserver{self.url}?cursor="
+        ))
+
+        response = self.client.get(response.data["users_next"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_invalid_cursor(self):
+        for position in (["user"], ["admin", 1], ["user", "1"], {"a": 1}, 7):
+            with self.subTest(position=position):
+                response = self.client.get(
+                    self.url, {"cursor": encode_cursor(position)}
+                )
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.data, {"error": "Invalid cursor"})
+
+
+class QuizDetailStatsTest(TestCase):
+    """
+    The quiz detail reads its participant count from the QuizStats
+    rollup, and rebuilding the rollup orphans the cached responses.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.creator = User.objects.create(username="creator",
+                                          email="creator@example.com")
+        cls.quiz = Quiz.objects.create(name="Quiz", creator=cls.creator)
+        QuizScore.objects.bulk_create([
+            QuizScore(quiz=cls.quiz, guest=f"Guest-{index}", score=1)
+            for index in range(3)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.creator)
+        self.url = f"/accounts/created-quiz/{self.quiz.pk}/"
+
+    def test_users_count_from_rollup(self):
+        QuizStats.objects.create(quiz=self.quiz, participants=3)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["users_count"], 3)
+
+    def test_rebuild_bumps_quiz_version(self):
+        scope = f"quiz:{self.quiz.pk}"
+        version = CacheVersion.get_many([scope])[scope]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            QuizStatsService.rebuild([self.quiz.pk])
+
+        self.assertEqual(CacheVersion.get_many([scope])[scope], version + 1)
+        self.assertEqual(self.quiz.stats.participants, 3)
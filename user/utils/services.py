@@ -1,8 +1,12 @@
 import logging
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Tuple, Optional
 from django.shortcuts import get_object_or_404
 from rest_framework import status
-from quiz_app.models import Quiz, UserAnswer
+from rest_framework.exceptions import ValidationError
+from quiz_app.models import Quiz, QuizStats
+from quiz_app.serializers import QuizSerializer
+from quiz_app.utils.paginators import encode_cursor, decode_cursor
+from quiz_app.utils.stats import QuizStatsService
 
 
 logger = logging.getLogger(__name__)
@@ -23,13 +27,16 @@ class QuizRetrievalService:
         """
         try:
             quiz = get_object_or_404(
-                Quiz.objects.prefetch_related("questions"),
+                Quiz.objects.select_related("creator", "stats"),
                 pk=quiz_id
             )
-            users_count = (
-                UserAnswer.objects.get_count_of_users_who_took_quiz(quiz.id)
+            try:
+                users_count = quiz.stats.participants
+            except QuizStats.DoesNotExist:
+                users_count = 0
+            users, next_cursor = Quiz.objects.get_users_who_took_this_quiz(
+                quiz
             )
-            users = Quiz.objects.get_users_who_took_this_quiz(quiz)
 
             quiz_data = {
                 "quiz": quiz,
@@ -37,9 +44,13 @@ class QuizRetrievalService:
                     "id": str(quiz.id),
                     "name": quiz.name,
                     "creator": quiz.creator.username,
-                    "total_score": quiz.get_total_score(),
+                    "total_score": quiz.total_score,
+                    "question_count": quiz.question_count,
                     "users_count": users_count,
                     "users": users,
+                    "users_next": (
+                        encode_cursor(next_cursor) if next_cursor else None
+                    ),
                 }
             }
             return True, quiz_data, status.HTTP_200_OK
@@ -58,6 +69,85 @@ class QuizRetrievalService:
                 status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @staticmethod
+    def _decode_participants_cursor(
+            cursor: Optional[str]
+    ) -> Optional[Tuple[str, Any]]:
+        """
+        Decode a participants cursor into a ("user", user_id) or
+        ("guest", guest_name) position.
+
+        :param cursor: Cursor string or None.
+        :return: Position or None for the first page.
+
+        :raises ValidationError: If the cursor is malformed.
+        """
+        position = decode_cursor(cursor)
+        if position is None:
+            return None
+        if not isinstance(position, list) or len(position) != 2:
+            raise ValidationError("Invalid cursor")
+        kind, key = position
+        valid_key = (
+            (kind == "user" and isinstance(key, int)
+             and not isinstance(key, bool))
+            or (kind == "guest" and isinstance(key, str))
+        )
+        if not valid_key:
+            raise ValidationError("Invalid cursor")
+        return kind, key
+
+    @staticmethod
+    def get_quiz_participants(quiz_id,
+                              user,
+                              cursor: Optional[str] = None,
+                              limit: int = 50
+                              ) -> Tuple[bool, Dict[str, Any], int]:
+        """
+        Retrieve a page of the participants of a quiz.
+
+        :param quiz_id: ID of the quiz.
+        :param user: User requesting the participants.
+        :param cursor: Cursor of the page, None for the first page.
+        :param limit: Maximum number of participants on the page.
+
+        :return: Tuple containing (success, data_or_error, status_code)
+        """
+        try:
+            quiz = Quiz.objects.get(pk=quiz_id, creator=user)
+        except Quiz.DoesNotExist:
+            logger.warning(f"Quiz with ID {quiz_id} not found")
+            return (
+                False,
+                {"error": "Quiz not found"},
+                status.HTTP_404_NOT_FOUND
+            )
+
+        try:
+            position = QuizRetrievalService._decode_participants_cursor(
+                cursor
+            )
+        except ValidationError:
+            return (
+                False,
+                {"error": "Invalid cursor"},
+                status.HTTP_400_BAD_REQUEST
+            )
+
+        users, next_cursor = Quiz.objects.get_users_who_took_this_quiz(
+            quiz,
+            position,
+            limit
+        )
+        return (
+            True,
+            {
+                "next": encode_cursor(next_cursor) if next_cursor else None,
+                "results": users,
+            },
+            status.HTTP_200_OK
+        )
+
 
 class QuizAnalyticsService:
     """
@@ -75,11 +165,16 @@ class QuizAnalyticsService:
         :return: Tuple containing (success, data_or_error, status_code)
         """
         try:
-            quiz = get_object_or_404(Quiz, pk=quiz_id, creator=user)
-            total_users = UserAnswer.objects.get_count_of_users_who_took_quiz(
-                quiz.id
+            quiz = get_object_or_404(
+                Quiz.objects.select_related("stats"),
+                pk=quiz_id,
+                creator=user
             )
-            hardest_questions = UserAnswer.objects.get_hardest_questions(
+            try:
+                total_users = quiz.stats.participants
+            except QuizStats.DoesNotExist:
+                total_users = 0
+            hardest_questions = QuizStatsService.get_hardest_questions(
                 quiz.id
             )
             analytics_data = {
@@ -102,3 +197,38 @@ class QuizAnalyticsService:
                 {"error": "An unexpected error occurred"},
                 status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+
+class QuizExportService:
+    """
+    Service for exporting the worksheets of many quizzes.
+    """
+    MAX_QUIZZES = 200
+
+    @classmethod
+    def get_export_data(cls, queryset, filters: Dict[str, Any]) -> List[Dict]:
+        """
+        Load and serialize the quizzes selected for an export with
+        a single prefetch of their questions and answers.
+
+        :param queryset: Quizzes the user can export.
+        :param filters: Validated BulkWorksheetExportSerializer data.
+        :return: Serialized data of every selected quiz.
+        """
+        if filters.get("quiz_ids"):
+            queryset = queryset.filter(id__in=filters["quiz_ids"])
+        if filters.get("name"):
+            queryset = queryset.filter(name__icontains=filters["name"])
+        if filters.get("created_after"):
+            queryset = queryset.filter(
+                created_at__gte=filters["created_after"]
+            )
+        if filters.get("created_before"):
+            queryset = queryset.filter(
+                created_at__lte=filters["created_before"]
+            )
+
+        quizzes = queryset.order_by("created_at", "id").prefetch_related(
+            "questions__answers"
+        )[:cls.MAX_QUIZZES]
+        return QuizSerializer(quizzes, many=True).data
@@ -1,8 +1,7 @@
 import logging
-from django.db.models import OuterRef
+from django.db.models import Exists, OuterRef, Prefetch, Subquery
 from django.shortcuts import render
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
+from django.conf import settings
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 
@@ -13,15 +12,21 @@ from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet, ReadOnlyModelViewSet
 from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.utils.urls import replace_query_param
 
+from mixins.cache_policy_mixin import CachePolicyMixin
 from quiz_app.permissions import IsCreator, CanSeeAnalysis
 from quiz_app.tasks import send_email
-from quiz_app.utils.paginators import CustomPaginator
+from quiz_app.utils.paginators import CustomPaginator, SelectablePaginator
 from quiz_app.utils import SerializerFactory
+from quiz_app.utils.cache_policy import CachePolicy
+from quiz_app.utils.worksheet import WorksheetArtifactStore
 
 from .utils.helpers import (get_verification_email_content,
                             get_reset_email_content)
-from .utils.services import QuizRetrievalService, QuizAnalyticsService
+from .utils.services import (QuizRetrievalService,
+                             QuizAnalyticsService,
+                             QuizExportService)
 from .serializers import *
 from rest_framework.views import APIView
 
@@ -89,7 +94,8 @@ class TakenQuizViewSet(ReadOnlyModelViewSet):
     quiz taken by the user.
     """
     serializer_class = UserQuizSerializer
-    pagination_class = CustomPaginator
+    pagination_class = SelectablePaginator
+    pagination_mode = "cursor"
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
@@ -99,21 +105,26 @@ class TakenQuizViewSet(ReadOnlyModelViewSet):
 
         :return: Queryset of quizzes taken by the user.
         """
+        user = self.request.user
+        user_scores = QuizScore.objects.filter(quiz=OuterRef("pk"), user=user)
         queryset = Quiz.objects.filter(
-            questions__your_answers__user=self.request.user
-        ).distinct().annotate(
-            your_score=QuizScore.objects.filter(
-                quiz=OuterRef("pk"), user=self.request.user
-            ).values("score")
+            Exists(user_scores)
+        ).annotate(
+            your_score=Subquery(
+                user_scores.order_by("-created_at").values("score")[:1]
+            )
         ).prefetch_related(
             "questions",
             "questions__answers",
-            "questions__your_answers"
+            Prefetch(
+                "questions__your_answers",
+                queryset=UserAnswer.objects.with_score().filter(user=user)
+            )
         )
         return queryset
 
 
-class CreatedQuizViewSet(ReadOnlyModelViewSet):
+class CreatedQuizViewSet(CachePolicyMixin, ReadOnlyModelViewSet):
     """
     This ViewSet is responsible for getting quizzes created by the user.
 
@@ -124,12 +135,26 @@ class CreatedQuizViewSet(ReadOnlyModelViewSet):
     serializer_class = SerializerFactory(  # type: ignore
         default=QuizForCreatorSerializer,
         retrieve=CreatedQuizDetailSerializer,
+        bulk_export=BulkWorksheetExportSerializer,
     )
-    pagination_class = CustomPaginator
+    pagination_class = SelectablePaginator
+    pagination_mode = "cursor"
     permission_classes = [IsAuthenticated, IsCreator]
 
     quiz_service = QuizRetrievalService()
     analytics_service = QuizAnalyticsService()
+    max_participants_page_size = 100
+
+    cache_policies = {
+        "list": CachePolicy(timeout=settings.VIEW_CACHE_TIMEOUT,
+                            versions=("creator:{user.pk}",)),
+        "retrieve": CachePolicy(timeout=settings.VIEW_CACHE_TIMEOUT,
+                                versions=("quiz:{pk}",)),
+        "participants": CachePolicy(timeout=settings.VIEW_CACHE_TIMEOUT,
+                                    versions=("quiz:{pk}",)),
+        "analytics": CachePolicy(timeout=settings.VIEW_CACHE_TIMEOUT,
+                                 versions=("quiz:{pk}",)),
+    }
 
     def get_queryset(self):
         """
@@ -168,12 +193,90 @@ class CreatedQuizViewSet(ReadOnlyModelViewSet):
             return Response(result, status=status_code)
         self.check_object_permissions(request, result["quiz"])
 
-        serializer = self.get_serializer(data=result["serializer_data"])
+        serializer_data = result["serializer_data"]
+        if serializer_data["users_next"]:
+            serializer_data["users_next"] = replace_query_param(
+                self.reverse_action("participants", kwargs={"pk": quiz_id}),
+                "cursor", serializer_data["users_next"]
+            )
+        serializer = self.get_serializer(data=serializer_data)
         if serializer.is_valid():
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-    @method_decorator(cache_page(10 * 1))
+    @action(
+        detail=True,
+        methods=["GET"],
+        url_path="participants",
+        permission_classes=[IsAuthenticated, IsCreator]
+    )
+    def participants(self, request, pk=None):
+        """
+        Get a page of the users who took a specific quiz, with their
+        answers. Follow the returned ``next`` link to get the
+        following page.
+
+        :param request: Request an object.
+        :param pk: Primary key of the quiz.
+
+        :return: Response object.
+        """
+        try:
+            page_size = min(
+                int(request.query_params.get("page_size", 50)),
+                self.max_participants_page_size
+            )
+        except ValueError:
+            page_size = 50
+        success, result, status_code = (
+            self.quiz_service.get_quiz_participants(
+                pk,
+                request.user,
+                request.query_params.get("cursor"),
+                max(page_size, 1)
+            )
+        )
+        if not success:
+            return Response(result, status=status_code)
+        if result["next"]:
+            result["next"] = replace_query_param(
+                request.build_absolute_uri(), "cursor", result["next"]
+            )
+        return Response(result, status=status.HTTP_200_OK)
+
+    @action(
+        detail=False,
+        methods=["POST"],
+        url_path="bulk-export",
+        permission_classes=[IsAuthenticated]
+    )
+    def bulk_export(self, request):
+        """
+        Export the worksheets of many quizzes into one ZIP archive.
+        The archive is rendered in the background, pending exports
+        return 202 until it is ready.
+
+        :param request: Request an object.
+
+        :return: Response object.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        quizzes = QuizExportService.get_export_data(
+            self.get_queryset(),
+            serializer.validated_data
+        )
+        if not quizzes:
+            return Response({"error": "No quizzes to export"},
+                            status=status.HTTP_404_NOT_FOUND)
+
+        data, status_code = WorksheetArtifactStore().export_many(
+            request,
+            quizzes
+        )
+        return Response(data, status=status_code)
+
     @action(
         detail=True,
         methods=["GET"],